@@ -2,13 +2,26 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import DOMAIN, PLATFORMS
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONF_EXCLUDED_NODES,
+    CONF_EXCLUDED_PARAMS,
+    CONF_LOCAL_CONTROL,
+    CONF_PUSH_TOPIC,
+    DATA_SCHEDULER,
+    DOMAIN,
+    PLATFORMS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,36 +40,173 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # dependencies (like `rainmaker-http`) at import time when the
     # config flow UI is loaded
     from .api import RainmakerAPI
-    from .coordinator import RainmakerCoordinator
+    from .coordinator import RainmakerCoordinator, SchemaDelta
+    from .profiling import SetupProfiler
+    from .scheduler import RainmakerScheduler
+
+    profiler = SetupProfiler(entry.entry_id)
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SCHEDULER not in domain_data:
+        domain_data[DATA_SCHEDULER] = RainmakerScheduler(hass)
+    scheduler: RainmakerScheduler = domain_data[DATA_SCHEDULER]
 
     api = RainmakerAPI(hass, host, username, password)
+    api.scheduler = scheduler
+    if entry.options.get(CONF_LOCAL_CONTROL):
+        from .transport import LocalTransport
+
+        api.local = LocalTransport(hass)
     try:
-        await api.async_connect()
+        with profiler.span("login"):
+            await api.async_connect()
     except Exception as err:
         _LOGGER.debug("Failed to connect to Rainmaker: %s", err)
         raise ConfigEntryNotReady from err
 
     coordinator = RainmakerCoordinator(hass, api, entry)
-    # Fetch initial data so platforms have data when they are first added
-    await coordinator.async_config_entry_first_refresh()
+    coordinator.profiler = profiler
+    delay = scheduler.async_register(entry.entry_id)
+    try:
+        # Fetch initial data so platforms have data when they are first added
+        await coordinator.async_config_entry_first_refresh()
+    except ConfigEntryNotReady:
+        scheduler.async_unregister(entry.entry_id)
+        raise
+    entry.async_on_unload(lambda: scheduler.async_unregister(entry.entry_id))
+
+    if delay:
+        # Stagger the polling phase of entries set up together: a refresh
+        # after the slot delay takes the place of the first interval
+        # refresh, and later ones follow from it
+        @callback
+        def _async_shift_phase(_now: datetime) -> None:
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{DOMAIN} phase shift"
+            )
+
+        entry.async_on_unload(async_call_later(hass, delay, _async_shift_phase))
 
     # Store runtime-only references
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+    domain_data[entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
+        "profiler": profiler,
     }
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Only set up the platforms the params of the account need, more are
+    # added when the schema grows
+    platforms = [p for p in PLATFORMS if p in coordinator.platforms]
+    entry_data = domain_data[entry.entry_id]
+    entry_data["platforms"] = set(platforms)
+    # Platforms being forwarded after setup, not loaded yet
+    entry_data["pending_platforms"] = set()
+    # Covers adding the entities, including their update before add
+    with profiler.span("platforms"):
+        await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    @callback
+    def _async_add_platforms(_delta: SchemaDelta) -> None:
+        known = entry_data["platforms"] | entry_data["pending_platforms"]
+        if new := [p for p in PLATFORMS if p in coordinator.platforms - known]:
+            entry_data["pending_platforms"].update(new)
+            entry.async_create_task(
+                hass, _async_forward_platforms(hass, entry, entry_data, new)
+            )
+
+    entry.async_on_unload(coordinator.async_add_schema_listener(_async_add_platforms))
+
+    @callback
+    def _async_remove_devices(delta: SchemaDelta) -> None:
+        # Only nodes gone from the account lose their device, and with it
+        # their entity registry entries. Excluded nodes are still listed.
+        device_registry = dr.async_get(hass)
+        for node_id in delta.removed.keys() - coordinator.discovered.keys():
+            if device := device_registry.async_get_device(
+                identifiers={(DOMAIN, node_id)}
+            ):
+                _LOGGER.debug("Removing device of node %s, it left the account", node_id)
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry.entry_id
+                )
+
+    entry.async_on_unload(coordinator.async_add_schema_listener(_async_remove_devices))
+
+    # Only the setup is profiled, later refreshes run without spans
+    coordinator.profiler = None
+    profiler.finish()
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+
+    # Backfill long-term statistics from the backend history, if offered
+    from .statistics import RainmakerStatisticsImporter
+
+    RainmakerStatisticsImporter(hass, api, coordinator, entry).async_start()
+
+    if topic := entry.options.get(CONF_PUSH_TOPIC):
+        from .push import RainmakerPushListener
+
+        push = RainmakerPushListener(hass, coordinator, topic)
+        entry.async_on_unload(push.async_stop)
+        entry.async_create_background_task(
+            hass, push.async_start(), f"{DOMAIN} push subscription"
+        )
 
     return True
 
 
+async def _async_forward_platforms(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    entry_data: dict[str, Any],
+    platforms: list[Platform],
+) -> None:
+    """Set up platforms that became needed after the entry was set up.
+
+    The platforms only count as loaded, and are unloaded with the entry,
+    once the forward returned.
+    """
+    _LOGGER.debug("Schema needs new platforms %s", platforms)
+    try:
+        async with entry.setup_lock:
+            # The entry may have been unloaded while waiting for the lock
+            if hass.data.get(DOMAIN, {}).get(entry.entry_id) is not entry_data:
+                return
+            await hass.config_entries.async_forward_entry_setups(entry, platforms)
+            entry_data["platforms"].update(platforms)
+    finally:
+        entry_data["pending_platforms"].difference_update(platforms)
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply a changed node/param selection without reloading the entry.
+
+    A changed push topic or local control setting needs new transports, so
+    it reloads the entry.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["coordinator"]
+    push_changed = (entry.options.get(CONF_PUSH_TOPIC) or None) != coordinator.push_topic
+    local_changed = bool(entry.options.get(CONF_LOCAL_CONTROL)) != (
+        entry_data["api"].local is not None
+    )
+    if push_changed or local_changed:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    await coordinator.async_set_selection(
+        entry.options.get(CONF_EXCLUDED_NODES, []),
+        entry.options.get(CONF_EXCLUDED_PARAMS, []),
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry and its platforms."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    platforms = entry_data["platforms"] if entry_data else PLATFORMS
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
     if unload_ok:
         # Remove runtime references if they exist
         domain_data = hass.data.get(DOMAIN)
         if domain_data and entry.entry_id in domain_data:
-            domain_data.pop(entry.entry_id)
+            await domain_data.pop(entry.entry_id)["api"].async_close()
     return unload_ok
@@ -1,10 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+from collections.abc import Callable
+import time
+from typing import TYPE_CHECKING, Any
 
-from aiohttp import ClientError
+from aiohttp import ClientError, ClientTimeout
 from rainmaker_http.client import RainmakerClient
+from yarl import URL
+
+from .const import (
+    LOCAL_DISCOVERY_RETRY,
+    PRIORITY_BULK,
+    PRIORITY_POLL,
+    PRIORITY_WRITE,
+    TSDATA_PAGE_SIZE,
+    TSDATA_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from .mapping import NodeSchema
+    from .scheduler import RainmakerScheduler
+    from .transport import LocalTransport
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +49,21 @@ class RainmakerAPI:
 
     This adapter implements the minimal operations used by the
     integration: login, nodes listing, params/config retrieval and batch set.
+
+    With a `local` transport, reads and writes of nodes reachable on the
+    LAN skip the cloud. The cloud is still used for the node listing until
+    every node is reachable locally, for any node that is not, and
+    periodically to discover nodes added to the account. When the cloud
+    fails while some nodes answered locally, those are returned and the
+    others are listed without param values.
+
+    With a `scheduler`, every cloud request waits for the request budget of
+    the host, which is shared with the other config entries.
+
+    Writes are sequenced per node: at most one write per node is in flight,
+    and writes issued meanwhile are coalesced into the next batch, where a
+    newer value for a param replaces an older one. Each acknowledged batch
+    is passed to `ack_listener` once, in the order the batches were sent.
     """
 
     def __init__(
@@ -43,22 +76,49 @@ class RainmakerAPI:
         self.password = str(password) if password is not None else ""
         self._client: RainmakerClient | None = None
         self._connected = False
-        # currently, we only support the multicontrol service
+        # Service of nodes whose schema is not known yet
         self._service_name: str = "multicontrol"
+        # Compiled param mapping per node, maintained by the coordinator
+        self.schemas: dict[str, NodeSchema] = {}
+        self.local: LocalTransport | None = None
+        self.scheduler: RainmakerScheduler | None = None
+        # Nodes not to poll, maintained by the coordinator
+        self.excluded_nodes: set[str] = set()
+        # Node configs and monotonic time of the last cloud listing
+        self._configs: dict[str, Any] = {}
+        self._listed_at = 0.0
+        # Per node write sequencing: the batch waiting to be sent, the future
+        # its writers wait on and the lock held by the batch in flight
+        self._write_pending: dict[str, dict[str, Any]] = {}
+        self._write_futures: dict[str, asyncio.Future[dict[str, Any]]] = {}
+        self._write_locks: dict[str, asyncio.Lock] = {}
+        # Called with the node id and values of every acknowledged batch
+        self.ack_listener: Callable[[str, dict[str, Any]], None] | None = None
 
     async def async_close(self) -> None:
         """Close any resources held by the adapter."""
-        if self._client is not None:
-            try:
-                await self._client.async_close()
-            except (
-                ClientError,
-                RuntimeError,
-            ) as err:  # pragma: no cover - defensive cleanup
-                _LOGGER.debug("Error closing rainmaker_http client: %s", err)
+        if self.local is not None:
+            await self.local.async_close()
+        if self._client is None:
+            return
+        client, self._client = self._client, None
+        self._connected = False
+        try:
+            await client.close()
+        except (
+            ClientError,
+            RuntimeError,
+        ) as err:  # pragma: no cover - defensive cleanup
+            _LOGGER.debug("Error closing rainmaker_http client: %s", err)
+
+    async def _async_acquire(self, priority: int) -> None:
+        """Wait for the shared request budget, if there is one."""
+        if self.scheduler is not None:
+            await self.scheduler.async_acquire(self.host, priority)
 
     async def async_connect(self) -> None:
         """Authenticate against Rainmaker using the PyPI client."""
+        await self._async_acquire(PRIORITY_POLL)
         try:
             client = RainmakerClient(self.host)
             self._client = client
@@ -75,23 +135,175 @@ class RainmakerAPI:
 
     async def async_get_nodes(self) -> dict[str, Any]:
         """Return a list of normalized nodes with params and params_meta."""
+        local: dict[str, dict[str, Any]] = {}
+        if self.local is not None and self._configs:
+            polled = self._configs.keys() - self.excluded_nodes
+            local = await self.local.async_get_nodes(polled)
+            listing_due = time.monotonic() > self._listed_at + LOCAL_DISCOVERY_RETRY
+            if local.keys() == polled and not listing_due:
+                return self._local_listing(local)
+
+        await self._async_acquire(PRIORITY_POLL)
         try:
             assert self._client is not None
-            data = await self._client.async_get_nodes(node_detail=True)
+            data = await self._client.async_get_nodes(node_details=True)
         except Exception as err:
+            if local:
+                _LOGGER.warning(
+                    "Failed to fetch nodes from the cloud, using the %s nodes "
+                    "reachable locally: %s",
+                    len(local),
+                    err,
+                )
+                return self._local_listing(local)
             _LOGGER.debug("Failed to fetch nodes: %s", err)
             raise RainmakerConnectionError("Failed to fetch nodes") from err
         if "node_details" not in data:
             raise RainmakerError(f"Wrong data format for nodes: {data}")
+
+        self._configs = {nd["id"]: nd.get("config") for nd in data["node_details"]}
+        self._listed_at = time.monotonic()
+        if local:
+            data["node_details"] = [
+                local.get(nd["id"], nd) for nd in data["node_details"]
+            ]
         return data
 
+    def _local_listing(self, local: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        """List the nodes of the last cloud listing with their local details.
+
+        Nodes without local details keep their config but have no param
+        values, so their entities stay registered but have no state.
+        """
+        return {
+            "nodes": sorted(self._configs),
+            "node_details": [
+                local.get(node_id)
+                or {"id": node_id, "config": config, "params": {}}
+                for node_id, config in sorted(self._configs.items())
+            ],
+        }
+
+    async def async_get_param_history(
+        self,
+        node_id: str,
+        param: str,
+        data_type: str,
+        start_time: int,
+        end_time: int,
+    ) -> list[tuple[int, Any]] | None:
+        """Return ``(timestamp, value)`` samples of a param between two epochs.
+
+        Pages through the Rainmaker time-series endpoint. Returns ``None``
+        when the backend does not offer time-series data.
+        """
+        if not self._connected:
+            raise RainmakerConnectionError("Not connected")
+
+        query: dict[str, Any] = {
+            "node_id": node_id,
+            "param_name": self._qualified_name(node_id, param),
+            "type": data_type,
+            "start_time": start_time,
+            "end_time": end_time,
+            "num_records": TSDATA_PAGE_SIZE,
+        }
+        samples: list[tuple[int, Any]] = []
+        while True:
+            await self._async_acquire(PRIORITY_BULK)
+            try:
+                data = await self._async_get_tsdata(query)
+            except Exception as err:
+                _LOGGER.debug("Failed to fetch history of %s.%s: %s", node_id, param, err)
+                raise RainmakerConnectionError("Failed to fetch history") from err
+            if data is None:
+                return None
+
+            for series in data.get("ts_data", []):
+                for point in series.get("values", []):
+                    samples.append((int(point["ts"]), point.get("val")))
+
+            next_id = data.get("next_id")
+            if not next_id:
+                return samples
+            query["start_id"] = next_id
+
+    async def _async_get_tsdata(self, query: dict[str, Any]) -> Any:
+        """Fetch one page of param history.
+
+        Uses the public `async_get_tsdata` of the client. Releases of
+        `rainmaker-http` without it only get the session and token of the
+        client for this request, and the backfill turns off when even those
+        are missing. Returns ``None`` when no time-series data is offered.
+        """
+        assert self._client is not None
+        client = self._client
+        if (get_tsdata := getattr(client, "async_get_tsdata", None)) is not None:
+            return await get_tsdata(query)
+
+        session = getattr(client, "_session", None)
+        headers = getattr(client, "_headers", None)
+        if session is None or headers is None:
+            _LOGGER.debug("rainmaker-http offers no time-series access")
+            return None
+        async with session.get(
+            str(URL(self.host) / "user/nodes/tsdata"),
+            headers=headers,
+            params=query,
+            timeout=ClientTimeout(total=TSDATA_TIMEOUT),
+        ) as resp:
+            if resp.status == 404:
+                return None
+            resp.raise_for_status()
+            return await resp.json()
+
     async def async_set_param(self, node_id: str, param: str, value: Any) -> None:
+        await self.async_set_params(node_id, {param: value})
+
+    async def async_set_params(
+        self, node_id: str, values: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Write params of a node, returns once the node acknowledged them.
+
+        Returns the values of the batch that was sent, which has newer
+        values of writes coalesced with this one and their other params.
+        """
         if not self._connected:
             raise RainmakerConnectionError("Not connected")
 
-        payload = {self._service_name: {param: value}}
+        self._write_pending.setdefault(node_id, {}).update(values)
+        if (future := self._write_futures.get(node_id)) is None:
+            future = asyncio.get_running_loop().create_future()
+            self._write_futures[node_id] = future
+            self._hass.async_create_task(self._async_flush_writes(node_id))
+        # Shielded, a cancelled writer must not cancel the batch of others
+        return await asyncio.shield(future)
+
+    async def _async_flush_writes(self, node_id: str) -> None:
+        """Send the pending batch of a node after the batch in flight."""
+        async with self._write_locks.setdefault(node_id, asyncio.Lock()):
+            values = self._write_pending.pop(node_id)
+            future = self._write_futures.pop(node_id)
+            try:
+                await self._async_send_params(node_id, values)
+            except Exception as err:  # noqa: BLE001 - handed to the writers
+                future.set_exception(err)
+                # Mark it retrieved, every writer may have been cancelled
+                future.exception()
+            else:
+                if self.ack_listener is not None:
+                    self.ack_listener(node_id, values)
+                future.set_result(values)
+
+    async def _async_send_params(self, node_id: str, values: dict[str, Any]) -> None:
+        payload = self._payload(node_id, values)
+        if self.local is not None and await self.local.async_set_params(
+            node_id, payload
+        ):
+            return
 
         batch = [{"node_id": node_id, "payload": payload}]
+        await self._async_acquire(PRIORITY_WRITE)
         try:
             assert self._client is not None
             result = await self._client.async_set_params(batch)
@@ -104,6 +316,17 @@ class RainmakerAPI:
                 if res.get("node_id") == node_id and res.get("status") != "success":
                     raise RainmakerError(f"Failed to set param: {res}")
 
+    def _payload(self, node_id: str, values: dict[str, Any]) -> dict[str, Any]:
+        """Serialize values keyed by param key into a params payload."""
+        if (schema := self.schemas.get(node_id)) is not None:
+            return schema.payload(values)
+        return {self._service_name: values}
+
+    def _qualified_name(self, node_id: str, param: str) -> str:
+        if (schema := self.schemas.get(node_id)) is not None:
+            return schema.qualified_name(param)
+        return f"{self._service_name}.{param}"
+
     @property
     def is_connected(self) -> bool:
         return bool(self._connected)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 import logging
-from functools import cached_property
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
@@ -12,7 +12,9 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
+from .classify import is_binary_sensor_param
 from .const import DOMAIN
+from .entity import async_add_param_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,28 +27,28 @@ class RainmakerParamBinarySensor(CoordinatorEntity, BinarySensorEntity):
         node_id: str,
         param: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, (node_id, param))
         self._entry_id = entry_id
         self._node_id = node_id
         self._param = param
         self._attr_name = f"{node_id} {param}"
         self._unique_id = f"{entry_id}_{node_id}_{param}"
 
-    @cached_property
+    @property
     def name(self) -> str | None:
         return self._attr_name
 
-    @cached_property
+    @property
     def unique_id(self) -> str | None:
         return self._unique_id
 
-    @cached_property
+    @property
     def is_on(self) -> bool | None:
         params = self.coordinator.data.get(self._node_id, {})
         value = params.get(self._param, {}).get("value")
         return bool(value) if value is not None else None
 
-    @cached_property
+    @property
     def device_info(self) -> DeviceInfo | None:
         return DeviceInfo(
             identifiers={(DOMAIN, self._node_id)},
@@ -55,6 +57,20 @@ class RainmakerParamBinarySensor(CoordinatorEntity, BinarySensorEntity):
         )
 
 
+def _build_entities(
+    coordinator: DataUpdateCoordinator,
+    entry_id: str,
+    node_id: str,
+    params: Mapping[str, dict[str, Any]],
+) -> list[RainmakerParamBinarySensor]:
+    entities: list[RainmakerParamBinarySensor] = []
+    for param, meta in params.items():
+        if is_binary_sensor_param(meta):
+            entity = RainmakerParamBinarySensor(coordinator, entry_id, node_id, param)
+            entities.append(entity)
+    return entities
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
@@ -65,15 +81,6 @@ async def async_setup_entry(
 
     coordinator: DataUpdateCoordinator = entry_data["coordinator"]
 
-    entities: list[RainmakerParamBinarySensor] = []
-    for node_id, params in coordinator.data.items():
-        for param, meta in params.items():
-            if (
-                meta.get("data_type") == "bool"
-                and "read" in meta.get("properties", [])
-                and "write" not in meta.get("properties", [])
-            ):
-                entity = RainmakerParamBinarySensor(coordinator, entry.entry_id, node_id, param)
-                entities.append(entity)
-
-    async_add_entities(entities, True)
\ No newline at end of file
+    async_add_param_entities(
+        hass, entry, coordinator, async_add_entities, _build_entities
+    )
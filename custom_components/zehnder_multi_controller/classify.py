@@ -0,0 +1,65 @@
+"""Param classification for Zehnder Multi Controller (Rainmaker).
+
+Kept free of platform imports so that the config entry can decide which
+platforms to set up before loading them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.const import Platform
+
+from .mapping import META_CLIMATE_ROLE, ROLE_CURRENT_TEMPERATURE
+
+
+def climate_param(params: Mapping[str, dict[str, Any]]) -> str | None:
+    """Return the current temperature param, which defines a climate entity."""
+    for param, meta in params.items():
+        if meta.get(META_CLIMATE_ROLE) == ROLE_CURRENT_TEMPERATURE:
+            return param
+    return None
+
+
+def is_sensor_param(meta: dict[str, Any]) -> bool:
+    return meta.get("data_type", "").lower() not in ("bool", "int", "float", "number")
+
+
+def is_number_param(meta: dict[str, Any]) -> bool:
+    return "write" in meta.get("properties", []) and meta.get("data_type") != "bool"
+
+
+def is_switch_param(meta: dict[str, Any]) -> bool:
+    return meta.get("data_type") == "bool" and "write" in meta.get("properties", [])
+
+
+def is_binary_sensor_param(meta: dict[str, Any]) -> bool:
+    return (
+        meta.get("data_type") == "bool"
+        and "read" in meta.get("properties", [])
+        and "write" not in meta.get("properties", [])
+    )
+
+
+PARAM_PLATFORMS = {
+    Platform.BINARY_SENSOR: is_binary_sensor_param,
+    Platform.NUMBER: is_number_param,
+    Platform.SENSOR: is_sensor_param,
+    Platform.SWITCH: is_switch_param,
+}
+
+
+def needed_platforms(data: Mapping[str, Mapping[str, dict[str, Any]]]) -> set[Platform]:
+    """Return the platforms that have entities for the given node data."""
+    platforms: set[Platform] = set()
+    for params in data.values():
+        if climate_param(params) is not None:
+            platforms.add(Platform.CLIMATE)
+        for meta in params.values():
+            for platform, is_platform_param in PARAM_PLATFORMS.items():
+                if platform not in platforms and is_platform_param(meta):
+                    platforms.add(platform)
+        if len(platforms) == len(PARAM_PLATFORMS) + 1:
+            break
+    return platforms
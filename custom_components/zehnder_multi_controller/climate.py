@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 import logging
-from functools import cached_property
 
 from homeassistant.components.climate import ClimateEntity, HVACMode, ClimateEntityFeature
 from homeassistant.config_entries import ConfigEntry
@@ -12,10 +12,18 @@ from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
 
+from .classify import climate_param
 from .const import DOMAIN
+from .mapping import (
+    ROLE_CURRENT_TEMPERATURE,
+    ROLE_ENABLED,
+    ROLE_FAN_SPEED,
+    ROLE_SEASON,
+    ROLE_TARGET_TEMPERATURE,
+)
+from .entity import async_add_param_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,10 +34,15 @@ class ZehnderClimate(CoordinatorEntity, ClimateEntity):
         coordinator: DataUpdateCoordinator,
         entry_id: str,
         node_id: str,
+        param: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, node_id)
         self._entry_id = entry_id
         self._node_id = node_id
+        # The climate entity exists as long as its node reports a temperature
+        self._param = param
+        # Param key per climate role, from the compiled mapping of the node
+        self._roles: dict[str, str] = {}
         self._attr_name = node_id
         self._unique_id = f"{entry_id}_{node_id}_climate"
 
@@ -42,17 +55,31 @@ class ZehnderClimate(CoordinatorEntity, ClimateEntity):
             "Creating ZehnderClimate for node %s", node_id
         )
 
+        self._update_roles()
         self._attr_supported_features = self.get_supported_features()
 
-    @cached_property
+    def _update_roles(self) -> None:
+        schema = self.coordinator.schemas.get(self._node_id)
+        self._roles = schema.climate if schema is not None else {}
+
+    def _role_meta(self, role: str) -> dict[str, Any] | None:
+        if (param := self._roles.get(role)) is None:
+            return None
+        return self.coordinator.data.get(self._node_id, {}).get(param)
+
+    def _role_value(self, role: str) -> Any:
+        meta = self._role_meta(role)
+        return meta.get("value") if meta is not None else None
+
+    @property
     def unique_id(self) -> str | None:
         return self._unique_id
 
-    @cached_property
+    @property
     def name(self) -> str | None:
         return self._attr_name
 
-    @cached_property
+    @property
     def device_info(self) -> DeviceInfo | None:
         return DeviceInfo(
             identifiers={(DOMAIN, self._node_id)},
@@ -60,36 +87,22 @@ class ZehnderClimate(CoordinatorEntity, ClimateEntity):
             manufacturer="ESP RainMaker",
         )
 
-    @cached_property
+    @property
     def current_temperature(self) -> float | None:
-        node_data = self.coordinator.data.get(self._node_id, {})
-        for param, meta in node_data.items():
-            if param.lower() == "temp":
-                return meta.get("value")
-        return None
+        return self._role_value(ROLE_CURRENT_TEMPERATURE)
 
-    @cached_property
+    @property
     def target_temperature(self) -> float | None:
-        node_data = self.coordinator.data.get(self._node_id, {})
-        for param, meta in node_data.items():
-            if param.lower() == "temp_setpoint":
-                return meta.get("value")
-        return None
+        return self._role_value(ROLE_TARGET_TEMPERATURE)
 
-    @cached_property
+    @property
     def hvac_modes(self) -> list[HVACMode]:
         return [HVACMode.HEAT, HVACMode.COOL, HVACMode.OFF]
 
-    @cached_property
+    @property
     def hvac_mode(self) -> HVACMode | None:
-        node_data = self.coordinator.data.get(self._node_id, {})
-        season = None
-        enabled = None
-        for param, meta in node_data.items():
-            if param.lower() == "season":
-                season = meta.get("value")
-            elif param.lower() == "radiant_enabled":
-                enabled = meta.get("value")
+        season = self._role_value(ROLE_SEASON)
+        enabled = self._role_value(ROLE_ENABLED)
         if not enabled:
             return HVACMode.OFF
         if season == 1:
@@ -100,20 +113,21 @@ class ZehnderClimate(CoordinatorEntity, ClimateEntity):
 
     def get_supported_features(self) -> ClimateEntityFeature:
         features_flag = ClimateEntityFeature(0)
-        node_data = self.coordinator.data.get(self._node_id, {})
 
-        has_temp_setpoint = "temp_setpoint" in node_data and "write" in node_data["temp_setpoint"].get("properties", [])
+        temp_setpoint = self._role_meta(ROLE_TARGET_TEMPERATURE)
+        has_temp_setpoint = temp_setpoint is not None and "write" in temp_setpoint.get("properties", [])
         if has_temp_setpoint:
             features_flag |= ClimateEntityFeature.TARGET_TEMPERATURE
 
-        has_fan = "fan_speed" in node_data and "write" in node_data["fan_speed"].get("properties", [])
+        fan_speed = self._role_meta(ROLE_FAN_SPEED)
+        has_fan = fan_speed is not None and "write" in fan_speed.get("properties", [])
         if has_fan:
             features_flag |= ClimateEntityFeature.FAN_MODE
 
         _LOGGER.debug(
-            "ZehnderClimate(%s) params keys=%s -> features=%s",
+            "ZehnderClimate(%s) roles=%s -> features=%s",
             self._node_id,
-            list(node_data.keys()),
+            self._roles,
             features_flag,
         )
 
@@ -121,6 +135,7 @@ class ZehnderClimate(CoordinatorEntity, ClimateEntity):
 
     def _handle_coordinator_update(self) -> None:
         try:
+            self._update_roles()
             self._attr_supported_features = self.get_supported_features()
         except Exception:  # pragma: no cover - defensive
             _LOGGER.exception(
@@ -128,50 +143,39 @@ class ZehnderClimate(CoordinatorEntity, ClimateEntity):
             )
         super()._handle_coordinator_update()
 
-    @cached_property
+    @property
     def fan_modes(self) -> list[str] | None:
         return ["level_0", "level_1", "level_2", "level_3"]
 
-    @cached_property
+    @property
     def fan_mode(self) -> str | None:
-        node_data = self.coordinator.data.get(self._node_id, {})
-        for param, meta in node_data.items():
-            if param.lower() == "fan_speed":
-                val = meta.get("value")
-                if val is None:
-                    return None
-                return f"level_{int(val)}"
-        return None
+        val = self._role_value(ROLE_FAN_SPEED)
+        if val is None:
+            return None
+        return f"level_{int(val)}"
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         temperature = kwargs.get("temperature")
         if temperature is None:
             return
         try:
-            await self.coordinator.api.async_set_param(
-                self._node_id, "temp_setpoint", temperature
+            await self.coordinator.async_set_params(
+                self._node_id, {self._roles[ROLE_TARGET_TEMPERATURE]: temperature}
             )
-            await self.coordinator.async_request_refresh()
         except Exception:  # pragma: no cover - runtime dependent
             _LOGGER.exception("Failed to set temperature on %s", self._node_id)
 
     async def async_set_hvac_mode(self, hvac_mode: str) -> None:
         try:
             if hvac_mode == HVACMode.OFF.value:
-                await self.coordinator.api.async_set_param(
-                    self._node_id, "radiant_enabled", False
-                )
+                values = {self._roles[ROLE_ENABLED]: False}
             elif hvac_mode == HVACMode.HEAT.value:
-                await self.coordinator.api.async_set_param(self._node_id, "season", 1)
-                await self.coordinator.api.async_set_param(
-                    self._node_id, "radiant_enabled", True
-                )
+                values = {self._roles[ROLE_SEASON]: 1, self._roles[ROLE_ENABLED]: True}
             elif hvac_mode == HVACMode.COOL.value:
-                await self.coordinator.api.async_set_param(self._node_id, "season", 2)
-                await self.coordinator.api.async_set_param(
-                    self._node_id, "radiant_enabled", True
-                )
-            await self.coordinator.async_request_refresh()
+                values = {self._roles[ROLE_SEASON]: 2, self._roles[ROLE_ENABLED]: True}
+            else:
+                return
+            await self.coordinator.async_set_params(self._node_id, values)
         except Exception:  # pragma: no cover - runtime dependent
             _LOGGER.exception("Failed to set hvac mode on %s", self._node_id)
 
@@ -180,14 +184,24 @@ class ZehnderClimate(CoordinatorEntity, ClimateEntity):
             if not fan_mode.startswith("level_"):
                 return
             level = int(fan_mode.split("_", 1)[1])
-            await self.coordinator.api.async_set_param(
-                self._node_id, "fan_speed", int(level)
+            await self.coordinator.async_set_params(
+                self._node_id, {self._roles[ROLE_FAN_SPEED]: int(level)}
             )
-            await self.coordinator.async_request_refresh()
         except Exception:  # pragma: no cover - runtime dependent
             _LOGGER.exception("Failed to set fan mode on %s", self._node_id)
 
 
+def _build_entities(
+    coordinator: DataUpdateCoordinator,
+    entry_id: str,
+    node_id: str,
+    params: Mapping[str, dict[str, Any]],
+) -> list[ZehnderClimate]:
+    if (param := climate_param(params)) is None:
+        return []
+    return [ZehnderClimate(coordinator, entry_id, node_id, param)]
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
@@ -199,23 +213,6 @@ async def async_setup_entry(
         return
     coordinator = entry_data["coordinator"]
 
-    entities: list[ZehnderClimate] = []
-    registry = er.async_get(hass)
-    for node_id, params in coordinator.data.items():
-        if "temp" not in params:
-            continue
-
-        unique_id = f"{entry.entry_id}_{node_id}_climate"
-
-        if registry.async_get_entity_id("climate", DOMAIN, unique_id) is not None:
-            _LOGGER.debug(
-                "Skipping climate entity for node %s because unique_id %s is already registered",
-                node_id,
-                unique_id,
-            )
-            continue
-
-        entities.append(ZehnderClimate(coordinator, entry.entry_id, node_id))
-
-    _LOGGER.debug("Adding %s climate entities", len(entities))
-    async_add_entities(entities, True)
+    async_add_param_entities(
+        hass, entry, coordinator, async_add_entities, _build_entities
+    )
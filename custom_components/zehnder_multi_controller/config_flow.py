@@ -5,16 +5,32 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-
-from .const import DOMAIN
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    CONF_EXCLUDED_NODES,
+    CONF_EXCLUDED_PARAMS,
+    CONF_LOCAL_CONTROL,
+    CONF_NODES,
+    CONF_PARAMS,
+    CONF_PUSH_TOPIC,
+    DOMAIN,
+)
+from .mapping import compile_node_schema
 from .api import (
             RainmakerAPI,
             RainmakerConnectionError,
             RainmakerAuthError,
+            RainmakerError,
         )
 
 
@@ -33,9 +49,53 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     api = RainmakerAPI(hass, data[CONF_HOST], data[CONF_USERNAME], data[CONF_PASSWORD])
-    await api.async_connect()
+    try:
+        await api.async_connect()
+        nodes = await discover_nodes(api)
+    finally:
+        await api.async_close()
+
+    return {"title": "Name of the device", "nodes": nodes}
+
+
+async def discover_nodes(api: RainmakerAPI) -> dict[str, list[str]]:
+    """Return the param keys of every node in the account."""
+    nodes = await api.async_get_nodes()
+    return {
+        nd["id"]: compile_node_schema(nd["config"]).keys
+        for nd in nodes["node_details"]
+    }
+
 
-    return {"title": "Name of the device"}
+def selection_schema(
+    discovered: dict[str, list[str]], options: dict[str, Any]
+) -> vol.Schema:
+    """Build the node/param selection form, pre-selecting included items."""
+    nodes = sorted(discovered)
+    params = sorted({param for params in discovered.values() for param in params})
+    excluded_nodes = set(options.get(CONF_EXCLUDED_NODES, []))
+    excluded_params = set(options.get(CONF_EXCLUDED_PARAMS, []))
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_NODES, default=[n for n in nodes if n not in excluded_nodes]
+            ): cv.multi_select({n: n for n in nodes}),
+            vol.Optional(
+                CONF_PARAMS, default=[p for p in params if p not in excluded_params]
+            ): cv.multi_select({p: p for p in params}),
+        }
+    )
+
+
+def selection_options(
+    discovered: dict[str, list[str]], user_input: dict[str, Any]
+) -> dict[str, Any]:
+    """Turn the included items of the selection form into excluded ones."""
+    params = {param for params in discovered.values() for param in params}
+    return {
+        CONF_EXCLUDED_NODES: sorted(set(discovered) - set(user_input[CONF_NODES])),
+        CONF_EXCLUDED_PARAMS: sorted(params - set(user_input[CONF_PARAMS])),
+    }
 
 
 class ZehnderConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -43,6 +103,17 @@ class ZehnderConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._data: dict[str, Any] = {}
+        self._title = ""
+        self._discovered: dict[str, list[str]] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow handler."""
+        return ZehnderOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -76,7 +147,85 @@ class ZehnderConfigFlow(ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(unique_id)
             self._abort_if_unique_id_configured()
 
-            return self.async_create_entry(title=info["title"], data=user_input)
+            self._data = user_input
+            self._title = info["title"]
+            self._discovered = info["nodes"]
+            return await self.async_step_select()
 
         # If we reach here, validation failed — redisplay form with errors
         return self.async_show_form(data_schema=STEP_USER_DATA_SCHEMA, errors=errors)
+
+    async def async_step_select(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Let the user pick the nodes and params to poll."""
+        if user_input is None:
+            return self.async_show_form(
+                step_id="select", data_schema=selection_schema(self._discovered, {})
+            )
+
+        return self.async_create_entry(
+            title=self._title,
+            data=self._data,
+            options=selection_options(self._discovered, user_input),
+        )
+
+
+class ZehnderOptionsFlow(OptionsFlow):
+    """Handle the selection and transport options of an existing entry."""
+
+    def __init__(self) -> None:
+        self._discovered: dict[str, list[str]] = {}
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Show the selection form, discovering nodes if the entry is not loaded."""
+        errors: dict[str, str] = {}
+        topic = (user_input or {}).get(CONF_PUSH_TOPIC, "")
+        if topic and "+" not in topic.split("/"):
+            # The `+` level of the topic carries the node id
+            errors[CONF_PUSH_TOPIC] = "invalid_topic"
+        elif user_input is not None:
+            return self.async_create_entry(
+                data={
+                    **self.config_entry.options,
+                    **selection_options(self._discovered, user_input),
+                    CONF_PUSH_TOPIC: topic,
+                    CONF_LOCAL_CONTROL: user_input.get(CONF_LOCAL_CONTROL, False),
+                }
+            )
+
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if entry_data and not self._discovered:
+            self._discovered = entry_data["coordinator"].discovered
+        elif not self._discovered:
+            data = self.config_entry.data
+            api = RainmakerAPI(
+                self.hass, data[CONF_HOST], data[CONF_USERNAME], data[CONF_PASSWORD]
+            )
+            try:
+                await api.async_connect()
+                self._discovered = await discover_nodes(api)
+            except RainmakerError as err:
+                _LOGGER.debug("Node discovery for the options failed: %s", err)
+                return self.async_abort(reason="cannot_connect")
+            finally:
+                await api.async_close()
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=selection_schema(self._discovered, options).extend(
+                {
+                    vol.Optional(
+                        CONF_PUSH_TOPIC, default=options.get(CONF_PUSH_TOPIC, "")
+                    ): str,
+                    vol.Optional(
+                        CONF_LOCAL_CONTROL,
+                        default=options.get(CONF_LOCAL_CONTROL, False),
+                    ): bool,
+                }
+            ),
+            errors=errors,
+        )
@@ -5,6 +5,8 @@ from typing import Any
 from homeassistant.const import Platform
 
 DOMAIN = "zehnder_multi_controller"
+# Key of the RainmakerScheduler shared by all entries in hass.data[DOMAIN]
+DATA_SCHEDULER = "scheduler"
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
     Platform.CLIMATE,
@@ -13,5 +15,47 @@ PLATFORMS: list[Platform] = [
     Platform.SWITCH,
 ]
 
+# Node/param selection, the form lists included items and options store
+# the excluded ones so that newly discovered nodes and params show up
+CONF_NODES = "nodes"
+CONF_PARAMS = "params"
+CONF_EXCLUDED_NODES = "excluded_nodes"
+CONF_EXCLUDED_PARAMS = "excluded_params"
+
+# MQTT topic filter for pushed param changes, empty disables push
+CONF_PUSH_TOPIC = "push_topic"
+
+# Talk to nodes over ESP local control when they are reachable on the LAN
+CONF_LOCAL_CONTROL = "local_control"
+# Seconds before an unreachable node is looked up on the LAN again
+LOCAL_DISCOVERY_RETRY = 600
+# Seconds to wait for mDNS lookups and local control requests
+LOCAL_TIMEOUT = 5
+
 # Default polling interval in seconds
-DEFAULT_SCAN_INTERVAL = 30
\ No newline at end of file
+DEFAULT_SCAN_INTERVAL = 30
+# Consistency sweep interval in seconds while the push stream is healthy
+PUSH_SWEEP_INTERVAL = 600
+
+# Request budget per backend host, shared by all entries
+REQUEST_BUDGET_RATE = 2.0  # requests per second
+REQUEST_BUDGET_BURST = 10
+# Tokens of the burst that bulk requests leave for writes and polls
+REQUEST_BUDGET_RESERVE = 3
+# Seconds between the first refreshes of consecutive entries
+REFRESH_STAGGER = 5
+# Request priorities, lower values are served first when the budget is
+# exhausted
+PRIORITY_WRITE = 0
+PRIORITY_POLL = 1
+PRIORITY_BULK = 2
+
+# Long-term statistics backfill from the Rainmaker time-series endpoint
+STATISTICS_BACKFILL_INTERVAL = timedelta(hours=1)
+STATISTICS_MAX_BACKFILL = timedelta(days=7)
+STATISTICS_STORAGE_VERSION = 1
+# Seconds to batch watermark writes of a backfill run
+STATISTICS_SAVE_DELAY = 10
+TSDATA_PAGE_SIZE = 200
+# Seconds to wait for a page of param history
+TSDATA_TIMEOUT = 30
@@ -1,24 +1,57 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
 from datetime import timedelta
 import logging
+import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
 from .api import RainmakerAPI
-from .const import DEFAULT_SCAN_INTERVAL
+from .classify import needed_platforms
+from .mapping import NodeSchema, compile_node_schema
+from .const import (
+    CONF_EXCLUDED_NODES,
+    CONF_EXCLUDED_PARAMS,
+    CONF_PUSH_TOPIC,
+    DEFAULT_SCAN_INTERVAL,
+)
+from .profiling import SetupProfiler
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class SchemaDelta:
+    """Nodes and params that appeared or disappeared between two refreshes.
+
+    A node that appears or disappears as a whole lists all of its params.
+    """
+
+    added: dict[str, set[str]] = field(default_factory=dict)
+    removed: dict[str, set[str]] = field(default_factory=dict)
+
+
 class RainmakerCoordinator(DataUpdateCoordinator):
-    """Coordinator to fetch Rainmaker nodes and params."""
+    """Coordinator to fetch Rainmaker nodes and params.
+
+    Listeners may pass a node id or a ``(node_id, param)`` tuple as context
+    and are then only called when that node or param changed. Listeners
+    without context are called on every update.
+
+    Acknowledged writes are applied right away and are the current value of
+    their param until a poll that started after the acknowledgement
+    supersedes them.
+    """
 
     def __init__(
         self, hass: HomeAssistant, api: RainmakerAPI, entry: object | None = None
@@ -31,6 +64,211 @@ class RainmakerCoordinator(DataUpdateCoordinator):
         )
         self.api = api
         self.entry = entry
+        options = getattr(entry, "options", None) or {}
+        self.excluded_nodes: set[str] = set(options.get(CONF_EXCLUDED_NODES, []))
+        api.excluded_nodes = self.excluded_nodes
+        self.excluded_params: set[str] = set(options.get(CONF_EXCLUDED_PARAMS, []))
+        self.push_topic: str | None = options.get(CONF_PUSH_TOPIC) or None
+        # Platforms with entities for the current schema
+        self.platforms: set[Platform] = set()
+        # Every node and its param keys, including excluded ones
+        self.discovered: dict[str, list[str]] = {}
+        # Compiled param mapping per node, shared with the API to serialize
+        # writes
+        self.schemas: dict[str, NodeSchema] = {}
+        api.schemas = self.schemas
+        api.ack_listener = self._handle_ack
+        self._schema: dict[str, frozenset[str]] = {}
+        self._pending_delta: SchemaDelta | None = None
+        self._schema_listeners: list[Callable[[SchemaDelta], None]] = []
+        self._poll_listeners: list[Callable[[dict[str, set[str]]], None]] = []
+        # Params changed by the last poll, set until it is published
+        self._polled: dict[str, set[str]] | None = None
+        # Params changed by the last refresh per node, None means everything
+        self._changed: dict[str, set[str]] | None = None
+        # Set while the config entry is being set up
+        self.profiler: SetupProfiler | None = None
+        # Acknowledged value and monotonic ack time per (node_id, param)
+        self._acked: dict[tuple[str, str], tuple[Any, float]] = {}
+
+    def span(self, name: str) -> AbstractContextManager[None]:
+        """Time a setup phase if the setup is being profiled."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.span(name)
+
+    async def async_set_selection(
+        self, excluded_nodes: list[str], excluded_params: list[str]
+    ) -> None:
+        """Change the excluded nodes and params and refresh.
+
+        The refresh publishes a schema delta, so entities of newly excluded
+        items are removed and re-included ones are added again.
+        """
+        self.excluded_nodes = set(excluded_nodes)
+        self.api.excluded_nodes = self.excluded_nodes
+        self.excluded_params = set(excluded_params)
+        await self.async_request_refresh()
+
+    @callback
+    def async_add_schema_listener(
+        self, listener: Callable[[SchemaDelta], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for schema deltas, called before the data listeners."""
+        self._schema_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._schema_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_add_poll_listener(
+        self, listener: Callable[[dict[str, set[str]]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for the params each successful poll changed per node.
+
+        Not called for the first refresh or one recovering from a failure,
+        which have nothing to compare to.
+        """
+        self._poll_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._poll_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Publish a pending schema delta, then update affected listeners."""
+        delta, self._pending_delta = self._pending_delta, None
+        if delta is not None:
+            for listener in list(self._schema_listeners):
+                listener(delta)
+
+        polled, self._polled = self._polled, None
+        if polled is not None and self.last_update_success:
+            for poll_listener in list(self._poll_listeners):
+                poll_listener(polled)
+
+        changed, self._changed = self._changed, None
+        if changed is None or not self.last_update_success:
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None:
+                update_callback()
+            elif isinstance(context, tuple):
+                node_id, param = context
+                if param in changed.get(node_id, ()):
+                    update_callback()
+            elif context in changed:
+                update_callback()
+
+    async def async_set_params(self, node_id: str, values: dict[str, Any]) -> None:
+        """Write params and apply them once the node acknowledged them.
+
+        No confirmation refresh is needed, the acknowledged values are the
+        current state until a newer poll supersedes them. Writes coalesced
+        into one batch are applied once, with the values that were sent.
+        """
+        await self.api.async_set_params(node_id, values)
+
+    @callback
+    def _handle_ack(self, node_id: str, values: dict[str, Any]) -> None:
+        """Record and apply a batch of params the node acknowledged."""
+        acked_at = time.monotonic()
+        for param, value in values.items():
+            self._acked[(node_id, param)] = (value, acked_at)
+        self.async_apply_params(node_id, values)
+
+    def _apply_acked(
+        self, nodes_dict: dict[str, dict[str, Any]], fetch_started: float
+    ) -> None:
+        """Keep acknowledged values a poll sent before the ack may not have."""
+        for (node_id, param), (value, acked_at) in list(self._acked.items()):
+            if acked_at <= fetch_started:
+                del self._acked[(node_id, param)]
+            elif (meta := nodes_dict.get(node_id, {}).get(param)) is not None:
+                meta["value"] = value
+
+    @callback
+    def async_apply_payload(self, node_id: str, payload: dict[str, Any]) -> None:
+        """Apply a Rainmaker params payload received outside of a refresh."""
+        if (schema := self.schemas.get(node_id)) is not None:
+            self.async_apply_params(node_id, schema.flatten(payload))
+
+    @callback
+    def async_apply_params(self, node_id: str, values: dict[str, Any]) -> None:
+        """Apply param values received outside of a refresh.
+
+        Unknown nodes and params, including excluded ones, are ignored and
+        only the listeners of the changed params are updated.
+        """
+        node = (self.data or {}).get(node_id)
+        if node is None:
+            return
+        changed = {
+            param
+            for param, value in values.items()
+            if param in node and node[param].get("value") != value
+        }
+        if not changed:
+            return
+
+        updated = dict(node)
+        for param in changed:
+            updated[param] = {**node[param], "value": values[param]}
+        self.data = {**self.data, node_id: updated}
+        self._changed = {node_id: changed}
+        self.async_update_listeners()
+
+    def _diff_values(self, nodes_dict: dict[str, dict[str, Any]]) -> None:
+        """Record which params changed compared to the current data."""
+        if self.data is None or not self.last_update_success:
+            # First refresh or recovering from a failure, update everything
+            self._changed = None
+            return
+
+        changed: dict[str, set[str]] = {}
+        for node_id in nodes_dict.keys() | self.data.keys():
+            old = self.data.get(node_id, {})
+            new = nodes_dict.get(node_id, {})
+            if old == new:
+                continue
+            changed[node_id] = {
+                param
+                for param in old.keys() | new.keys()
+                if old.get(param) != new.get(param)
+            }
+        self._changed = self._polled = changed
+
+    def _diff_schema(self, nodes_dict: dict[str, dict[str, Any]]) -> None:
+        """Record the node/param schema and queue a delta if it changed."""
+        schema = {node_id: frozenset(params) for node_id, params in nodes_dict.items()}
+        previous, self._schema = self._schema, schema
+        if schema == previous:
+            return
+        with self.span("classify"):
+            self.platforms = needed_platforms(nodes_dict)
+        # The first refresh defines the schema the platforms set up from
+        if self.data is None:
+            return
+
+        delta = SchemaDelta()
+        for node_id, params in schema.items():
+            if added := params - previous.get(node_id, frozenset()):
+                delta.added[node_id] = set(added)
+        for node_id, params in previous.items():
+            if removed := params - schema.get(node_id, frozenset()):
+                delta.removed[node_id] = set(removed)
+        _LOGGER.debug(
+            "Schema changed: added=%s removed=%s", delta.added, delta.removed
+        )
+        self._pending_delta = delta
 
     async def _ensure_connected(self):
         # Ensure API is connected
@@ -40,22 +278,39 @@ class RainmakerCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         await self._ensure_connected()
+        fetch_started = time.monotonic()
         try:
-            nodes = await self.api.async_get_nodes()
+            with self.span("fetch"):
+                nodes = await self.api.async_get_nodes()
         except Exception as err:
             raise UpdateFailed(err) from err
 
-        if not ("nodes" in nodes and "node_details" in nodes):
-            raise UpdateFailed(f"API response not in the excepted format: {nodes}")
-
-        nodes_dict = {}
-        for nd in nodes["node_details"]:
-            node_id = nd["id"]
-            config_params = nd["config"]["devices"][0]["params"]
-            param_vals = nd["params"]["multicontrol"]
-            transformed_params = {}
-            for param, meta in config_params.items():
-                transformed_params[param] = meta.copy()
-                transformed_params[param]["value"] = param_vals.get(param)
-            nodes_dict[node_id] = transformed_params
+        with self.span("decode"):
+            if not ("nodes" in nodes and "node_details" in nodes):
+                raise UpdateFailed(f"API response not in the excepted format: {nodes}")
+
+            decoded = []
+            discovered = {}
+            for nd in nodes["node_details"]:
+                node_id = nd["id"]
+                schema = compile_node_schema(nd["config"])
+                discovered[node_id] = schema.keys
+                if node_id in self.excluded_nodes:
+                    continue
+                decoded.append((node_id, schema, nd["params"]))
+
+        with self.span("transform"):
+            nodes_dict = {}
+            schemas = {}
+            for node_id, schema, param_vals in decoded:
+                schemas[node_id] = schema
+                nodes_dict[node_id] = schema.transform(param_vals, self.excluded_params)
+            self._apply_acked(nodes_dict, fetch_started)
+
+        self.discovered = discovered
+        # Update in place, the API holds a reference
+        self.schemas.clear()
+        self.schemas.update(schemas)
+        self._diff_schema(nodes_dict)
+        self._diff_values(nodes_dict)
         return nodes_dict
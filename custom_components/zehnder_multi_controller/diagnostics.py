@@ -0,0 +1,34 @@
+"""Diagnostics support for Zehnder Multi Controller (Rainmaker)."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry, loaded or not."""
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "setup_timings": None,
+        "nodes": {},
+    }
+    if (entry_data := hass.data.get(DOMAIN, {}).get(entry.entry_id)) is None:
+        return diagnostics
+
+    coordinator = entry_data["coordinator"]
+    diagnostics["setup_timings"] = entry_data["profiler"].as_dict()
+    diagnostics["nodes"] = {
+        node_id: sorted(params) for node_id, params in (coordinator.data or {}).items()
+    }
+    return diagnostics
@@ -0,0 +1,81 @@
+"""Shared entity helpers for Zehnder Multi Controller (Rainmaker)."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import (
+    AddEntitiesCallback,
+    async_get_current_platform,
+)
+
+from .coordinator import RainmakerCoordinator, SchemaDelta
+
+_LOGGER = logging.getLogger(__name__)
+
+# Builds the entities of one platform for a subset of a node's params
+EntityBuilder = Callable[
+    [RainmakerCoordinator, str, str, Mapping[str, dict[str, Any]]], list[Entity]
+]
+
+
+@callback
+def async_add_param_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: RainmakerCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    build: EntityBuilder,
+) -> None:
+    """Add entities for the current schema and keep them in sync with it.
+
+    Entities are tracked by unique id. Schema deltas published by the
+    coordinator add entities for new params and remove the entities of
+    params that disappeared, without reloading the config entry. Their
+    registry entries are kept, so a param that comes back, for example
+    when it is included again, keeps its entity id and settings. Entities
+    must expose the `_node_id` and `_param` they are built from.
+    """
+    tracked: dict[str, Entity] = {}
+    platform = async_get_current_platform().domain
+
+    @callback
+    def _add(params_by_node: Mapping[str, Mapping[str, dict[str, Any]]]) -> None:
+        entities: list[Entity] = []
+        with coordinator.span(f"{platform}.classify"):
+            for node_id, params in params_by_node.items():
+                for entity in build(coordinator, entry.entry_id, node_id, params):
+                    if entity.unique_id in tracked:
+                        continue
+                    tracked[entity.unique_id] = entity
+                    entities.append(entity)
+        if entities:
+            with coordinator.span(f"{platform}.register"):
+                async_add_entities(entities, True)
+
+    @callback
+    def _handle_schema_delta(delta: SchemaDelta) -> None:
+        for unique_id, entity in list(tracked.items()):
+            if entity._param not in delta.removed.get(entity._node_id, ()):
+                continue
+            _LOGGER.debug("Removing entity %s, its param disappeared", unique_id)
+            del tracked[unique_id]
+            # The registry entry stays, so the user's customizations come
+            # back with the param. Devices of nodes gone from the account
+            # are removed with their entries by the config entry.
+            hass.async_create_task(entity.async_remove())
+
+        _add(
+            {
+                node_id: {param: coordinator.data[node_id][param] for param in params}
+                for node_id, params in delta.added.items()
+            }
+        )
+
+    _add(coordinator.data)
+    entry.async_on_unload(coordinator.async_add_schema_listener(_handle_schema_delta))
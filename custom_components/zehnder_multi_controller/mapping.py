@@ -0,0 +1,157 @@
+"""Declarative param mapping for Zehnder Multi Controller (Rainmaker).
+
+A Rainmaker node config lists devices and services, each with its own
+params. `SERVICE_MAPPINGS` describes per device or service name how its
+params become entities and which params fill the climate roles. A node
+config is compiled once per distinct config into a `NodeSchema` with
+flat accessors, so every poll transforms a node in a single pass.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+import json
+from typing import Any
+
+ROLE_CURRENT_TEMPERATURE = "current_temperature"
+ROLE_TARGET_TEMPERATURE = "target_temperature"
+ROLE_ENABLED = "enabled"
+ROLE_SEASON = "season"
+ROLE_FAN_SPEED = "fan_speed"
+
+# Meta key that marks the params filling a climate role
+META_CLIMATE_ROLE = "climate_role"
+# Meta key of the unit of measurement, from the node config or the mapping
+META_UNIT = "unit"
+
+
+@dataclass(frozen=True)
+class ServiceMapping:
+    """How the params of a device or service map to entities.
+
+    Params of the `primary` device keep their bare name as key, params of
+    other devices and services are keyed ``<device>.<param>``. Climate
+    roles map to param names, matched case-insensitively, and so do units,
+    which only apply when the node config does not declare one.
+    """
+
+    include: bool = True
+    primary: bool = False
+    climate_roles: Mapping[str, str] = field(default_factory=dict)
+    units: Mapping[str, str] = field(default_factory=dict)
+
+
+SERVICE_MAPPINGS: dict[str, ServiceMapping] = {
+    "multicontrol": ServiceMapping(
+        primary=True,
+        climate_roles={
+            ROLE_CURRENT_TEMPERATURE: "temp",
+            ROLE_TARGET_TEMPERATURE: "temp_setpoint",
+            ROLE_ENABLED: "radiant_enabled",
+            ROLE_SEASON: "season",
+            ROLE_FAN_SPEED: "fan_speed",
+        },
+        units={"temp": "°C", "temp_setpoint": "°C"},
+    ),
+}
+# Unmapped devices become entities, unmapped services (time, schedules,
+# system) do not
+DEFAULT_DEVICE_MAPPING = ServiceMapping()
+DEFAULT_SERVICE_MAPPING = ServiceMapping(include=False)
+
+
+def _config_params(entry: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the params of a device or service keyed by name.
+
+    Accepts the params either as a list of param objects or keyed by name.
+    """
+    params = entry.get("params", {})
+    if isinstance(params, dict):
+        return params
+    return {param["name"]: param for param in params}
+
+
+class NodeSchema:
+    """Compiled accessors and serializers for one node config."""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        # (device, [(key, param name, meta)]) in config order
+        self._accessors: list[tuple[str, list[tuple[str, str, dict[str, Any]]]]] = []
+        self._names: dict[str, tuple[str, str]] = {}
+        self._keys: dict[tuple[str, str], str] = {}
+        self.climate: dict[str, str] = {}
+
+        entries = [(d, DEFAULT_DEVICE_MAPPING) for d in config.get("devices", [])]
+        entries += [(s, DEFAULT_SERVICE_MAPPING) for s in config.get("services", [])]
+        for entry, default in entries:
+            device = entry["name"]
+            mapping = SERVICE_MAPPINGS.get(device, default)
+            if not mapping.include:
+                continue
+            roles = {name.lower(): role for role, name in mapping.climate_roles.items()}
+            units = {name.lower(): unit for name, unit in mapping.units.items()}
+            accessors = []
+            for name, meta in _config_params(entry).items():
+                key = name if mapping.primary else f"{device}.{name}"
+                meta = dict(meta)
+                if role := roles.get(name.lower()):
+                    meta[META_CLIMATE_ROLE] = role
+                    self.climate[role] = key
+                if (unit := units.get(name.lower())) and not meta.get(META_UNIT):
+                    meta[META_UNIT] = unit
+                accessors.append((key, name, meta))
+                self._names[key] = (device, name)
+                self._keys[(device, name)] = key
+            self._accessors.append((device, accessors))
+
+    @property
+    def keys(self) -> list[str]:
+        """Return the sorted keys of all mapped params."""
+        return sorted(self._names)
+
+    def transform(
+        self, values: dict[str, Any], excluded: set[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Merge param values into the param metadata, keyed by param key."""
+        params: dict[str, dict[str, Any]] = {}
+        for device, accessors in self._accessors:
+            device_values = values.get(device) or {}
+            for key, name, meta in accessors:
+                if key in excluded:
+                    continue
+                params[key] = {**meta, "value": device_values.get(name)}
+        return params
+
+    def flatten(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Return the values of a Rainmaker params payload keyed by param key."""
+        return {
+            key: value
+            for device, device_values in payload.items()
+            if isinstance(device_values, dict)
+            for name, value in device_values.items()
+            if (key := self._keys.get((device, name))) is not None
+        }
+
+    def payload(self, values: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        """Serialize values keyed by param key into a Rainmaker params payload."""
+        payload: dict[str, dict[str, Any]] = {}
+        for key, value in values.items():
+            device, name = self._names[key]
+            payload.setdefault(device, {})[name] = value
+        return payload
+
+    def qualified_name(self, key: str) -> str:
+        """Return the ``<device>.<param>`` name of a param key."""
+        return ".".join(self._names[key])
+
+
+@lru_cache(maxsize=64)
+def _compile(serialized: str) -> NodeSchema:
+    return NodeSchema(json.loads(serialized))
+
+
+def compile_node_schema(config: dict[str, Any]) -> NodeSchema:
+    """Return the compiled schema of a node config, cached per config."""
+    return _compile(json.dumps(config, sort_keys=True))
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 import logging
-from functools import cached_property
 
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
@@ -12,7 +12,9 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
+from .classify import is_number_param
 from .const import DOMAIN
+from .entity import async_add_param_entities
 
 """Number platform for Zehnder Multi Controller (Rainmaker)."""
 
@@ -28,7 +30,7 @@ class RainmakerParamNumber(CoordinatorEntity, NumberEntity):
         node_id: str,
         param: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, (node_id, param))
         self._entry_id = entry_id
         self._node_id = node_id
         self._param = param
@@ -38,20 +40,20 @@ class RainmakerParamNumber(CoordinatorEntity, NumberEntity):
         self._attr_max_value = None
         self._attr_step = None
 
-    @cached_property
+    @property
     def name(self) -> str | None:
         return self._attr_name
 
-    @cached_property
+    @property
     def unique_id(self) -> str | None:
         return self._unique_id
 
-    @cached_property
+    @property
     def native_value(self) -> float | None:
         params = self.coordinator.data.get(self._node_id, {})
         return params.get(self._param, {}).get("value")
 
-    @cached_property
+    @property
     def device_info(self) -> DeviceInfo | None:
         return DeviceInfo(
             identifiers={(DOMAIN, self._node_id)},
@@ -64,15 +66,33 @@ class RainmakerParamNumber(CoordinatorEntity, NumberEntity):
         try:
             await self.hass.data[DOMAIN][self._entry_id][
                 "coordinator"
-            ].api.async_set_param(self._node_id, self._param, value)
+            ].async_set_params(self._node_id, {self._param: value})
         except Exception:  # pragma: no cover - surface errors to logs
             _LOGGER.exception(
                 "Error setting param %s on node %s", self._param, self._node_id
             )
-        finally:
-            await self.hass.data[DOMAIN][self._entry_id][
-                "coordinator"
-            ].async_request_refresh()
+
+
+def _build_entities(
+    coordinator: DataUpdateCoordinator,
+    entry_id: str,
+    node_id: str,
+    params: Mapping[str, dict[str, Any]],
+) -> list[RainmakerParamNumber]:
+    entities: list[RainmakerParamNumber] = []
+    for param, meta in params.items():
+        if is_number_param(meta):
+            entity = RainmakerParamNumber(coordinator, entry_id, node_id, param)
+
+            # populate number ranges from metadata if present
+            bounds = meta.get("bounds", {})
+            if isinstance(bounds, dict):
+                entity._attr_min_value = bounds.get("min")
+                entity._attr_max_value = bounds.get("max")
+                entity._attr_step = bounds.get("step")
+
+            entities.append(entity)
+    return entities
 
 
 async def async_setup_entry(
@@ -85,19 +105,6 @@ async def async_setup_entry(
 
     coordinator: DataUpdateCoordinator = entry_data["coordinator"]
 
-    entities: list[RainmakerParamNumber] = []
-    for node_id, params in coordinator.data.items():
-        for param, meta in params.items():
-            if "write" in meta.get("properties", []) and meta.get("data_type") != "bool":
-                entity = RainmakerParamNumber(coordinator, entry.entry_id, node_id, param)
-
-                # populate number ranges from metadata if present
-                bounds = meta.get("bounds", {})
-                if isinstance(bounds, dict):
-                    entity._attr_min_value = bounds.get("min")
-                    entity._attr_max_value = bounds.get("max")
-                    entity._attr_step = bounds.get("step")
-
-                entities.append(entity)
-
-    async_add_entities(entities, True)
+    async_add_param_entities(
+        hass, entry, coordinator, async_add_entities, _build_entities
+    )
@@ -0,0 +1,52 @@
+"""Setup timing spans for Zehnder Multi Controller (Rainmaker)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SetupProfiler:
+    """Collect the time spent in each phase of a config entry setup.
+
+    Spans with the same name accumulate, so a phase that runs once per
+    node or platform reports its total.
+    """
+
+    def __init__(self, entry_id: str) -> None:
+        self.entry_id = entry_id
+        self.spans: dict[str, float] = {}
+        self.total: float | None = None
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the wrapped block as phase `name`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.spans[name] = self.spans.get(name, 0.0) + elapsed
+            _LOGGER.debug("Setup %s: %s took %.3f s", self.entry_id, name, elapsed)
+
+    def finish(self) -> None:
+        """Stop the setup clock and log the breakdown."""
+        self.total = time.perf_counter() - self._started
+        _LOGGER.debug(
+            "Setup %s took %.3f s: %s",
+            self.entry_id,
+            self.total,
+            ", ".join(f"{name}={elapsed:.3f}s" for name, elapsed in self.spans.items()),
+        )
+
+    def as_dict(self) -> dict[str, float | dict[str, float] | None]:
+        """Return the timings in seconds for diagnostics."""
+        return {
+            "total": None if self.total is None else round(self.total, 4),
+            "spans": {name: round(elapsed, 4) for name, elapsed in self.spans.items()},
+        }
@@ -0,0 +1,125 @@
+"""MQTT push updates for Zehnder Multi Controller (Rainmaker)."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import json
+import logging
+
+from homeassistant.components import mqtt
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DEFAULT_SCAN_INTERVAL, PUSH_SWEEP_INTERVAL
+from .coordinator import RainmakerCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RainmakerPushListener:
+    """Apply param changes pushed over MQTT to the coordinator data.
+
+    The topic is a subscription filter such as ``node/+/params/local``, the
+    ``+`` level carries the node id and the payload is a Rainmaker params
+    object. While the stream is healthy polling drops to a slow consistency
+    sweep.
+
+    A broker connection alone does not make the stream healthy, the topic
+    may be wrong or the nodes may not publish. Each poll probes the stream:
+    a poll that finds no change the stream missed verifies it, so a quiet
+    house still sweeps slowly. A poll that finds changes the stream did not
+    deliver marks it as missing updates, and only a received message makes
+    it healthy again. The first poll after a (re)connect is not judged, it
+    catches up on changes made while the stream was down.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: RainmakerCoordinator, topic: str
+    ) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.topic = topic
+        self._node_level = topic.split("/").index("+")
+        self._unsubscribers: list[CALLBACK_TYPE] = []
+        self._connected = False
+        # A message or a poll without missed changes since the connect
+        self._verified = False
+        # A poll found changes the stream did not deliver, until a message
+        self._missing = False
+        # The next poll catches up on the time the stream was down
+        self._catching_up = False
+        self.healthy = False
+
+    async def async_start(self) -> None:
+        """Subscribe to the topic once the MQTT client is available."""
+        if not await mqtt.async_wait_for_mqtt_client(self.hass):
+            _LOGGER.warning("MQTT is not available, staying on polling")
+            return
+        self._unsubscribers.append(
+            await mqtt.async_subscribe(self.hass, self.topic, self._handle_message)
+        )
+        self._unsubscribers.append(
+            mqtt.async_subscribe_connection_status(self.hass, self._set_connected)
+        )
+        self._unsubscribers.append(
+            self.coordinator.async_add_poll_listener(self._handle_poll)
+        )
+        self._set_connected(mqtt.is_connected(self.hass))
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe from the topic, the connection status and the polls."""
+        while self._unsubscribers:
+            self._unsubscribers.pop()()
+
+    @callback
+    def _set_connected(self, connected: bool) -> None:
+        self._connected = connected
+        self._verified = False
+        self._catching_up = connected
+        self._update_health()
+
+    @callback
+    def _handle_poll(self, changed: dict[str, set[str]]) -> None:
+        if not self._connected:
+            return
+        if self._catching_up:
+            self._catching_up = False
+            return
+        if changed:
+            if not self._missing:
+                _LOGGER.debug("Push stream missed changes of %s", changed)
+            self._missing = True
+            self._verified = False
+        elif not self._missing:
+            self._verified = True
+        self._update_health()
+
+    @callback
+    def _update_health(self) -> None:
+        healthy = self._connected and self._verified and not self._missing
+        if healthy == self.healthy:
+            return
+        self.healthy = healthy
+        seconds = PUSH_SWEEP_INTERVAL if healthy else DEFAULT_SCAN_INTERVAL
+        _LOGGER.debug("Push stream healthy=%s, polling every %s s", healthy, seconds)
+        self.coordinator.update_interval = timedelta(seconds=seconds)
+        if not healthy:
+            # Changes may have been missed while the stream was down
+            self.hass.async_create_task(self.coordinator.async_request_refresh())
+
+    @callback
+    def _handle_message(self, msg: mqtt.ReceiveMessage) -> None:
+        try:
+            node_id = msg.topic.split("/")[self._node_level]
+            payload = json.loads(msg.payload)
+        except (IndexError, TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring push message on %s: %s", msg.topic, err)
+            return
+        if not isinstance(payload, dict):
+            _LOGGER.debug("Ignoring push message on %s: not an object", msg.topic)
+            return
+        self.coordinator.async_apply_payload(node_id, payload)
+        # Whatever it carried, a message proves the topic is published
+        self._missing = False
+        self._verified = self._connected
+        self._update_health()
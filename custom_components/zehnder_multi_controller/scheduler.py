@@ -0,0 +1,129 @@
+"""Request scheduling shared by all Zehnder Multi Controller config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    PRIORITY_BULK,
+    REFRESH_STAGGER,
+    REQUEST_BUDGET_BURST,
+    REQUEST_BUDGET_RATE,
+    REQUEST_BUDGET_RESERVE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _TokenBucket:
+    """Token bucket that hands out tokens to waiters by priority.
+
+    Bulk requests only take a token while more than `reserve` are left, so
+    a backfill cannot drain the burst that writes and polls rely on.
+    """
+
+    def __init__(self, rate: float, capacity: float, reserve: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._reserve = reserve
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def async_acquire(self, priority: int) -> None:
+        self._refill()
+        if not self._waiters and self._tokens >= self._needed(priority):
+            self._tokens -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        # The new waiter may be served sooner than the one the timer is for
+        if self._timer is not None:
+            self._timer.cancel()
+        self._wake()
+        await future
+
+    def _needed(self, priority: int) -> float:
+        """Return the tokens that must be available to serve `priority`."""
+        return 1 + (self._reserve if priority >= PRIORITY_BULK else 0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def _schedule(self) -> None:
+        if self._timer is not None or not self._waiters:
+            return
+        needed = self._needed(self._waiters[0][0])
+        delay = max(0.0, (needed - self._tokens) / self._rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self) -> None:
+        self._timer = None
+        self._refill()
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            # Waiters cancelled while queued do not consume a token
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < self._needed(priority):
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            future.set_result(None)
+        self._schedule()
+
+
+class RainmakerScheduler:
+    """Spread requests of all config entries over time.
+
+    Each backend host gets a token bucket request budget. When it runs out,
+    writes are served before polls and polls before bulk history reads,
+    which also leave a reserve of the burst untouched.
+    Entries also get a refresh slot, which staggers the phases of their
+    polling.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._buckets: dict[str, _TokenBucket] = {}
+        self._slots: list[str | None] = []
+
+    def async_register(self, entry_id: str) -> float:
+        """Assign a refresh slot, returns the polling phase offset in seconds."""
+        if None in self._slots:
+            slot = self._slots.index(None)
+            self._slots[slot] = entry_id
+        else:
+            slot = len(self._slots)
+            self._slots.append(entry_id)
+        delay = float(slot * REFRESH_STAGGER % DEFAULT_SCAN_INTERVAL)
+        _LOGGER.debug("Entry %s got refresh slot %s (delay %s s)", entry_id, slot, delay)
+        return delay
+
+    def async_unregister(self, entry_id: str) -> None:
+        """Free the refresh slot of an entry."""
+        if entry_id in self._slots:
+            self._slots[self._slots.index(entry_id)] = None
+
+    async def async_acquire(self, host: str, priority: int) -> None:
+        """Wait until the request budget of `host` allows another request."""
+        if (bucket := self._buckets.get(host)) is None:
+            bucket = self._buckets[host] = _TokenBucket(
+                REQUEST_BUDGET_RATE, REQUEST_BUDGET_BURST, REQUEST_BUDGET_RESERVE
+            )
+        await bucket.async_acquire(priority)
@@ -1,18 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 import logging
-from functools import cached_property
 
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
+from .classify import is_sensor_param
 from .const import DOMAIN
+from .entity import async_add_param_entities
+from .mapping import META_UNIT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,27 +29,27 @@ class RainmakerParamSensor(CoordinatorEntity, SensorEntity):
         node_id: str,
         param: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, (node_id, param))
         self._entry_id = entry_id
         self._node_id = node_id
         self._param = param
         self._attr_name = f"{node_id} {param}"
         self._unique_id = f"{entry_id}_{node_id}_{param}"
 
-    @cached_property
+    @property
     def name(self) -> str | None:
         return self._attr_name
 
-    @cached_property
+    @property
     def unique_id(self) -> str | None:
         return self._unique_id
 
-    @cached_property
+    @property
     def native_value(self) -> Any:
         params = self.coordinator.data.get(self._node_id, {})
         return params.get(self._param, {}).get("value")
 
-    @cached_property
+    @property
     def device_info(self) -> DeviceInfo | None:
         return DeviceInfo(
             identifiers={(DOMAIN, self._node_id)},
@@ -54,6 +58,28 @@ class RainmakerParamSensor(CoordinatorEntity, SensorEntity):
         )
 
 
+def _build_entities(
+    coordinator: DataUpdateCoordinator,
+    entry_id: str,
+    node_id: str,
+    params: Mapping[str, dict[str, Any]],
+) -> list[RainmakerParamSensor]:
+    entities: list[RainmakerParamSensor] = []
+    for param, meta in params.items():
+        if is_sensor_param(meta):
+            entity = RainmakerParamSensor(coordinator, entry_id, node_id, param)
+            # Attach simple metadata-driven attributes
+            unit = meta.get(META_UNIT)
+            entity._attr_native_unit_of_measurement = unit
+            if unit in UnitOfTemperature:
+                entity._attr_device_class = SensorDeviceClass.TEMPERATURE
+            elif "humidity" in param.lower():
+                entity._attr_device_class = SensorDeviceClass.HUMIDITY
+
+            entities.append(entity)
+    return entities
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
@@ -64,21 +90,6 @@ async def async_setup_entry(
 
     coordinator: DataUpdateCoordinator = entry_data["coordinator"]
 
-    entities: list[RainmakerParamSensor] = []
-    for node_id, params in coordinator.data.items():
-        for param, meta in params.items():
-            dtype = meta.get("data_type", "").lower()
-            if dtype not in ("bool", "int", "float", "number"):
-                entity = RainmakerParamSensor(coordinator, entry.entry_id, node_id, param)
-                # Attach simple metadata-driven attributes
-                unit = None
-                device_class = None
-                if "temp" in param.lower():
-                    entity._attr_native_unit_of_measurement = "°C"
-                    entity._attr_device_class = SensorDeviceClass.TEMPERATURE
-                elif "humidity" in param.lower():
-                    entity._attr_device_class = SensorDeviceClass.HUMIDITY
-
-                entities.append(entity)
-
-    async_add_entities(entities, True)
+    async_add_param_entities(
+        hass, entry, coordinator, async_add_entities, _build_entities
+    )
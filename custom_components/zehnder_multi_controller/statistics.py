@@ -0,0 +1,189 @@
+"""Long-term statistics backfill for Zehnder Multi Controller (Rainmaker)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from .api import RainmakerAPI
+from .const import (
+    DOMAIN,
+    STATISTICS_BACKFILL_INTERVAL,
+    STATISTICS_MAX_BACKFILL,
+    STATISTICS_SAVE_DELAY,
+    STATISTICS_STORAGE_VERSION,
+)
+from .coordinator import RainmakerCoordinator
+from .mapping import META_UNIT
+
+_LOGGER = logging.getLogger(__name__)
+
+NUMERIC_DATA_TYPES = ("int", "float")
+
+# Newer recorders take the unit class in the statistic metadata,
+# older recorders reject the key
+_HAS_UNIT_CLASS = "unit_class" in StatisticMetaData.__annotations__
+
+
+def _hourly_statistics(
+    samples: list[tuple[int, Any]], end_ts: int
+) -> list[StatisticData]:
+    """Aggregate raw samples before `end_ts` into hourly mean/min/max rows."""
+    buckets: dict[int, list[float]] = {}
+    for ts, value in samples:
+        if value is None or ts >= end_ts:
+            continue
+        try:
+            buckets.setdefault(ts - ts % 3600, []).append(float(value))
+        except (TypeError, ValueError):
+            continue
+
+    return [
+        StatisticData(
+            start=dt_util.utc_from_timestamp(start),
+            mean=sum(values) / len(values),
+            min=min(values),
+            max=max(values),
+        )
+        for start, values in sorted(buckets.items())
+    ]
+
+
+class RainmakerStatisticsImporter:
+    """Import Rainmaker param history into long-term statistics.
+
+    Every numeric param is imported as an external statistic. A watermark
+    per node/param is persisted so that each run only fetches the hours
+    that are not yet imported, which fills holes left by cloud outages or
+    Home Assistant downtime.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: RainmakerAPI,
+        coordinator: RainmakerCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        self.hass = hass
+        self.api = api
+        self.coordinator = coordinator
+        self.entry = entry
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.statistics"
+        )
+        self._watermarks: dict[str, dict[str, int]] | None = None
+        self._lock = asyncio.Lock()
+        self._supported = True
+
+    def async_start(self) -> None:
+        """Run a backfill now and then periodically until the entry unloads."""
+        self.entry.async_create_background_task(
+            self.hass, self.async_backfill(), f"{DOMAIN} statistics backfill"
+        )
+        self.entry.async_on_unload(
+            async_track_time_interval(
+                self.hass, self._async_scheduled_backfill, STATISTICS_BACKFILL_INTERVAL
+            )
+        )
+
+    async def _async_scheduled_backfill(self, _now: datetime) -> None:
+        await self.async_backfill()
+
+    async def async_backfill(self) -> None:
+        """Import all complete hours since the stored watermarks."""
+        if not self._supported or self._lock.locked():
+            return
+        async with self._lock:
+            if self._watermarks is None:
+                stored = await self._store.async_load() or {}
+                self._watermarks = stored.get("watermarks", {})
+
+            end = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+            try:
+                await self._async_backfill_since(
+                    int((end - STATISTICS_MAX_BACKFILL).timestamp()),
+                    int(end.timestamp()),
+                )
+            finally:
+                # One write per run, however many params advanced
+                self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"watermarks": self._watermarks}
+
+    async def _async_backfill_since(self, oldest: int, end_ts: int) -> None:
+        assert self._watermarks is not None
+        for node_id, params in (self.coordinator.data or {}).items():
+            for param, meta in params.items():
+                if meta.get("data_type", "").lower() not in NUMERIC_DATA_TYPES:
+                    continue
+                node_marks = self._watermarks.setdefault(node_id, {})
+                start_ts = max(node_marks.get(param, oldest), oldest)
+                if start_ts >= end_ts:
+                    continue
+                try:
+                    samples = await self.api.async_get_param_history(
+                        node_id, param, meta["data_type"].lower(), start_ts, end_ts
+                    )
+                except Exception as err:  # pragma: no cover - runtime dependent
+                    # Keep the watermark, the next run retries the gap
+                    _LOGGER.debug(
+                        "History backfill of %s %s failed: %s", node_id, param, err
+                    )
+                    continue
+                if samples is None:
+                    _LOGGER.debug("Backend offers no param history, backfill disabled")
+                    self._supported = False
+                    return
+
+                self._async_import(node_id, param, meta, samples, end_ts)
+                node_marks[param] = end_ts
+
+    def _async_import(
+        self,
+        node_id: str,
+        param: str,
+        meta: dict[str, Any],
+        samples: list[tuple[int, Any]],
+        end_ts: int,
+    ) -> None:
+        statistics = _hourly_statistics(samples, end_ts)
+        if not statistics:
+            return
+        unit = meta.get(META_UNIT)
+        metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.ARITHMETIC,
+            has_sum=False,
+            name=f"{node_id} {param}",
+            source=DOMAIN,
+            statistic_id=f"{DOMAIN}:{slugify(f'{node_id}_{param}')}",
+            unit_of_measurement=unit,
+        )
+        if _HAS_UNIT_CLASS:
+            metadata["unit_class"] = (  # type: ignore[typeddict-unknown-key]
+                TemperatureConverter.UNIT_CLASS
+                if unit in TemperatureConverter.VALID_UNITS
+                else None
+            )
+        _LOGGER.debug(
+            "Importing %s hourly statistics for %s %s", len(statistics), node_id, param
+        )
+        async_add_external_statistics(self.hass, metadata, statistics)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 import logging
-from functools import cached_property
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
@@ -12,7 +12,9 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
+from .classify import is_switch_param
 from .const import DOMAIN
+from .entity import async_add_param_entities
 
 """Switch platform for Zehnder Multi Controller (Rainmaker)."""
 
@@ -27,28 +29,28 @@ class RainmakerParamSwitch(CoordinatorEntity, SwitchEntity):
         node_id: str,
         param: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, (node_id, param))
         self._entry_id = entry_id
         self._node_id = node_id
         self._param = param
         self._attr_name = f"{node_id} {param}"
         self._unique_id = f"{entry_id}_{node_id}_{param}"
 
-    @cached_property
+    @property
     def name(self) -> str | None:
         return self._attr_name
 
-    @cached_property
+    @property
     def unique_id(self) -> str | None:
         return self._unique_id
 
-    @cached_property
+    @property
     def is_on(self) -> bool | None:
         params = self.coordinator.data.get(self._node_id, {})
         value = params.get(self._param, {}).get("value")
         return bool(value) if value is not None else None
 
-    @cached_property
+    @property
     def device_info(self) -> DeviceInfo | None:
         return DeviceInfo(
             identifiers={(DOMAIN, self._node_id)},
@@ -60,27 +62,33 @@ class RainmakerParamSwitch(CoordinatorEntity, SwitchEntity):
         try:
             await self.hass.data[DOMAIN][self._entry_id][
                 "coordinator"
-            ].api.async_set_param(self._node_id, self._param, True)
+            ].async_set_params(self._node_id, {self._param: True})
         except Exception:  # pragma: no cover - surface errors to logs
             _LOGGER.exception("Error turning on %s on node %s", self._param, self._node_id)
-        finally:
-            await self.hass.data[DOMAIN][self._entry_id][
-                "coordinator"
-            ].async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         try:
             await self.hass.data[DOMAIN][self._entry_id][
                 "coordinator"
-            ].api.async_set_param(self._node_id, self._param, False)
+            ].async_set_params(self._node_id, {self._param: False})
         except Exception:  # pragma: no cover - surface errors to logs
             _LOGGER.exception(
                 "Error turning off %s on node %s", self._param, self._node_id
             )
-        finally:
-            await self.hass.data[DOMAIN][self._entry_id][
-                "coordinator"
-            ].async_request_refresh()
+
+
+def _build_entities(
+    coordinator: DataUpdateCoordinator,
+    entry_id: str,
+    node_id: str,
+    params: Mapping[str, dict[str, Any]],
+) -> list[RainmakerParamSwitch]:
+    entities: list[RainmakerParamSwitch] = []
+    for param, meta in params.items():
+        if is_switch_param(meta):
+            entity = RainmakerParamSwitch(coordinator, entry_id, node_id, param)
+            entities.append(entity)
+    return entities
 
 
 async def async_setup_entry(
@@ -93,11 +101,6 @@ async def async_setup_entry(
 
     coordinator: DataUpdateCoordinator = entry_data["coordinator"]
 
-    entities: list[RainmakerParamSwitch] = []
-    for node_id, params in coordinator.data.items():
-        for param, meta in params.items():
-            if meta.get("data_type") == "bool" and "write" in meta.get("properties", []):
-                entity = RainmakerParamSwitch(coordinator, entry.entry_id, node_id, param)
-                entities.append(entity)
-
-    async_add_entities(entities, True)
+    async_add_param_entities(
+        hass, entry, coordinator, async_add_entities, _build_entities
+    )
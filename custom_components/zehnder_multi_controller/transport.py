@@ -0,0 +1,266 @@
+"""Local control transport for Zehnder Multi Controller (Rainmaker).
+
+Rainmaker nodes with local control enabled run the ESP local control
+service on the LAN. It is advertised over mDNS as
+``<node_id>._esp_local_ctrl._tcp.local.`` and exposes the node ``config``
+and ``params`` as JSON properties over protobuf messages posted via HTTP.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+
+from homeassistant.components import zeroconf
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from zeroconf import Error as ZeroconfError
+from zeroconf.asyncio import AsyncServiceInfo
+
+from .const import LOCAL_DISCOVERY_RETRY, LOCAL_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_TYPE = "_esp_local_ctrl._tcp.local."
+
+# LocalCtrlMessage types and payload fields from esp_local_ctrl.proto
+_MSG_GET_PROPERTY_COUNT = 0
+_MSG_GET_PROPERTY_VALUES = 4
+_MSG_SET_PROPERTY_VALUES = 6
+_FIELD_CMD_GET_PROPERTY_COUNT = 10
+_FIELD_RESP_GET_PROPERTY_COUNT = 11
+_FIELD_CMD_GET_PROPERTY_VALUES = 12
+_FIELD_RESP_GET_PROPERTY_VALUES = 13
+_FIELD_CMD_SET_PROPERTY_VALUES = 14
+_FIELD_RESP_SET_PROPERTY_VALUES = 15
+
+# SessionData with security scheme 0 and an empty S0SessionCmd
+_SEC0_SESSION_CMD = b"\x52\x03\xa2\x01\x00"
+
+
+class LocalControlError(Exception):
+    """Raised when a node cannot be reached over local control."""
+
+
+# Failures that make a single node unreachable, including malformed
+# responses (ValueError covers JSON and UTF-8 decoding errors)
+_NODE_ERRORS = (
+    ClientError,
+    TimeoutError,
+    KeyError,
+    IndexError,
+    TypeError,
+    ValueError,
+    ZeroconfError,
+    LocalControlError,
+)
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _field(number: int, value: int | bytes) -> bytes:
+    """Encode a varint or length-delimited protobuf field."""
+    if isinstance(value, int):
+        return _varint(number << 3) + _varint(value)
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+def _parse(data: bytes) -> dict[int, list[int | bytes]]:
+    """Decode a protobuf message into its varint and length-delimited fields."""
+    fields: dict[int, list[int | bytes]] = {}
+    pos = 0
+
+    def read_varint() -> int:
+        nonlocal pos
+        result = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return result
+
+    while pos < len(data):
+        key = read_varint()
+        number, wire_type = key >> 3, key & 0x07
+        value: int | bytes
+        if wire_type == 0:
+            value = read_varint()
+        elif wire_type == 2:
+            length = read_varint()
+            value = data[pos : pos + length]
+            pos += length
+        else:
+            raise LocalControlError(f"Unsupported protobuf wire type {wire_type}")
+        fields.setdefault(number, []).append(value)
+    return fields
+
+
+def _status_ok(message: bytes) -> bool:
+    return _parse(message).get(1, [0])[0] == 0
+
+
+class LocalTransport:
+    """Read and write node params over ESP local control.
+
+    Endpoints are resolved over mDNS and cached per node. A node that can
+    not be resolved or reached is retried after `LOCAL_DISCOVERY_RETRY`
+    seconds, in between the caller falls back to the cloud. Writes only use
+    endpoints the polls already resolved, so a write never waits for an
+    mDNS lookup. Only nodes without transport security (security scheme 0)
+    are supported.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._endpoints: dict[str, str] = {}
+        self._unreachable: dict[str, float] = {}
+        # Property indices and the node config, which only change with firmware
+        self._indices: dict[str, dict[str, int]] = {}
+        self._configs: dict[str, Any] = {}
+        self._session: ClientSession | None = None
+
+    async def async_close(self) -> None:
+        """Release the session to the nodes."""
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        # The connector is shared by Home Assistant, which owns closing it
+        session.detach()
+
+    async def async_get_nodes(self, node_ids: set[str]) -> dict[str, dict[str, Any]]:
+        """Return the node details of every node reachable on the LAN."""
+        results = await asyncio.gather(
+            *(self._async_get_node(node_id) for node_id in node_ids)
+        )
+        return {nd["id"]: nd for nd in results if nd is not None}
+
+    async def async_set_params(self, node_id: str, payload: dict[str, Any]) -> bool:
+        """Write params to a node, returns False if it is not reachable."""
+        if not (endpoint := self._endpoints.get(node_id)):
+            return False
+        try:
+            index = self._indices[node_id]["params"]
+            value = json.dumps(payload).encode()
+            command = _field(1, _MSG_SET_PROPERTY_VALUES) + _field(
+                _FIELD_CMD_SET_PROPERTY_VALUES,
+                _field(1, _field(1, index) + _field(2, value)),
+            )
+            resp = await self._async_request(endpoint, command)
+            if not _status_ok(resp[_FIELD_RESP_SET_PROPERTY_VALUES][0]):
+                raise LocalControlError("Node rejected the params")
+        except _NODE_ERRORS as err:
+            self._mark_unreachable(node_id, err)
+            return False
+        return True
+
+    async def _async_get_node(self, node_id: str) -> dict[str, Any] | None:
+        try:
+            if not (endpoint := await self._async_endpoint(node_id)):
+                return None
+            values = await self._async_get_properties(
+                endpoint, [self._indices[node_id]["params"]]
+            )
+            params = json.loads(values["params"])
+            if not isinstance(params, dict):
+                raise LocalControlError("Node params are not an object")
+        except _NODE_ERRORS as err:
+            self._mark_unreachable(node_id, err)
+            return None
+        return {"id": node_id, "config": self._configs[node_id], "params": params}
+
+    async def _async_endpoint(self, node_id: str) -> str | None:
+        """Return the cached endpoint of a node, resolving it if needed."""
+        if endpoint := self._endpoints.get(node_id):
+            return endpoint
+        if time.monotonic() < self._unreachable.get(node_id, 0):
+            return None
+        if not (endpoint := await self._async_resolve(node_id)):
+            self._mark_unreachable(node_id, "not advertised over mDNS")
+            return None
+
+        await self._async_post(endpoint, "session", _SEC0_SESSION_CMD)
+        count_resp = await self._async_request(
+            endpoint,
+            _field(1, _MSG_GET_PROPERTY_COUNT) + _field(_FIELD_CMD_GET_PROPERTY_COUNT, b""),
+        )
+        count = _parse(count_resp[_FIELD_RESP_GET_PROPERTY_COUNT][0]).get(2, [0])[0]
+        values = await self._async_get_properties(endpoint, list(range(count)))
+        config = json.loads(values["config"])
+        if not isinstance(config, dict):
+            raise LocalControlError("Node config is not an object")
+        self._indices[node_id] = {name: i for i, name in enumerate(values)}
+        self._configs[node_id] = config
+        self._endpoints[node_id] = endpoint
+        _LOGGER.debug("Node %s reachable over local control at %s", node_id, endpoint)
+        return endpoint
+
+    async def _async_resolve(self, node_id: str) -> str | None:
+        """Look up the local control endpoint of a node over mDNS."""
+        aiozc = await zeroconf.async_get_async_instance(self.hass)
+        info = AsyncServiceInfo(SERVICE_TYPE, f"{node_id}.{SERVICE_TYPE}")
+        if not await info.async_request(aiozc.zeroconf, LOCAL_TIMEOUT * 1000):
+            return None
+        return f"http://{info.parsed_addresses()[0]}:{info.port}"
+
+    async def _async_get_properties(
+        self, endpoint: str, indices: list[int]
+    ) -> dict[str, bytes]:
+        packed = b"".join(_varint(i) for i in indices)
+        resp = await self._async_request(
+            endpoint,
+            _field(1, _MSG_GET_PROPERTY_VALUES)
+            + _field(_FIELD_CMD_GET_PROPERTY_VALUES, _field(1, packed)),
+        )
+        message = resp[_FIELD_RESP_GET_PROPERTY_VALUES][0]
+        if not _status_ok(message):
+            raise LocalControlError("Node rejected the property read")
+        values: dict[str, bytes] = {}
+        for prop in _parse(message).get(2, []):
+            fields = _parse(prop)
+            name, value = fields[2][0], fields.get(5, [b""])[0]
+            if not isinstance(name, bytes) or not isinstance(value, bytes):
+                raise LocalControlError("Malformed property")
+            values[name.decode()] = value
+        return values
+
+    async def _async_request(
+        self, endpoint: str, command: bytes
+    ) -> dict[int, list[int | bytes]]:
+        return _parse(await self._async_post(endpoint, "control", command))
+
+    async def _async_post(self, endpoint: str, path: str, body: bytes) -> bytes:
+        if self._session is None:
+            # A dedicated session keeps the connection the node ties the
+            # protocomm session to
+            self._session = async_create_clientsession(self.hass)
+        async with self._session.post(
+            f"{endpoint}/esp_local_ctrl/{path}",
+            data=body,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=ClientTimeout(total=LOCAL_TIMEOUT),
+        ) as resp:
+            resp.raise_for_status()
+            return await resp.read()
+
+    def _mark_unreachable(self, node_id: str, reason: Any) -> None:
+        if node_id in self._endpoints or node_id not in self._unreachable:
+            _LOGGER.debug("Node %s not reachable locally: %s", node_id, reason)
+        self._endpoints.pop(node_id, None)
+        self._unreachable[node_id] = time.monotonic() + LOCAL_DISCOVERY_RETRY
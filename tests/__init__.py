@@ -0,0 +1 @@
+"""Tests for the Zehnder Multi Controller integration."""
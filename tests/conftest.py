@@ -0,0 +1,139 @@
+"""Fixtures for Zehnder Multi Controller tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from aiohttp import web
+import pytest
+
+from custom_components.zehnder_multi_controller.api import RainmakerAPI
+from custom_components.zehnder_multi_controller.coordinator import (
+    RainmakerCoordinator,
+)
+from homeassistant.core import HomeAssistant
+
+NODE_ID = "node1"
+NODE_CONFIG = {
+    "node_id": NODE_ID,
+    "devices": [
+        {
+            "name": "multicontrol",
+            "params": [
+                {"name": "temp", "data_type": "float", "properties": ["read"]},
+                {
+                    "name": "temp_setpoint",
+                    "data_type": "float",
+                    "properties": ["read", "write"],
+                },
+            ],
+        }
+    ],
+}
+NODE_PARAMS = {"multicontrol": {"temp": 21.5, "temp_setpoint": 22.0}}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(request: pytest.FixtureRequest) -> None:
+    """Enable the custom integration in every test.
+
+    The recorder must be set up before Home Assistant, so tests using it
+    get it first.
+    """
+    if "recorder_mock" in request.fixturenames:
+        request.getfixturevalue("recorder_mock")
+    request.getfixturevalue("enable_custom_integrations")
+
+
+class CloudStandIn:
+    """Stand-in for the Rainmaker cloud endpoints used by the integration."""
+
+    def __init__(self) -> None:
+        self.available = True
+        # None serves a listing without node details
+        self.node_details: list[dict[str, Any]] | None = [
+            {"id": NODE_ID, "config": NODE_CONFIG, "params": NODE_PARAMS}
+        ]
+        # Pages served by the tsdata endpoint in turn, None serves a 404
+        self.tsdata_pages: list[dict[str, Any]] | None = None
+        self.requests: list[tuple[str, str, dict[str, str], Any]] = []
+        # Requests to a path wait for its event once recorded
+        self.gates: dict[str, asyncio.Event] = {}
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/login2", self._login)
+        app.router.add_get("/user/nodes", self._nodes)
+        app.router.add_put("/user/nodes/params", self._set_params)
+        app.router.add_get("/user/nodes/tsdata", self._tsdata)
+        return app
+
+    async def _record(self, request: web.Request) -> Any:
+        body = await request.json() if request.can_read_body else None
+        self.requests.append((request.method, request.path, dict(request.query), body))
+        if (gate := self.gates.get(request.path)) is not None:
+            await gate.wait()
+        if not self.available:
+            raise web.HTTPServiceUnavailable
+        return body
+
+    async def _login(self, request: web.Request) -> web.Response:
+        await self._record(request)
+        return web.json_response({"status": "success", "accesstoken": "token"})
+
+    async def _nodes(self, request: web.Request) -> web.Response:
+        await self._record(request)
+        if self.node_details is None:
+            return web.json_response({"status": "failure"})
+        return web.json_response(
+            {
+                "nodes": [nd["id"] for nd in self.node_details],
+                "node_details": self.node_details,
+            }
+        )
+
+    async def _set_params(self, request: web.Request) -> web.Response:
+        batch = await self._record(request)
+        return web.json_response(
+            [{"node_id": item["node_id"], "status": "success"} for item in batch]
+        )
+
+    async def _tsdata(self, request: web.Request) -> web.Response:
+        await self._record(request)
+        if self.tsdata_pages is None:
+            raise web.HTTPNotFound
+        return web.json_response(self.tsdata_pages.pop(0))
+
+
+@pytest.fixture
+async def cloud(
+    aiohttp_server: Any, socket_enabled: None
+) -> AsyncGenerator[tuple[CloudStandIn, str]]:
+    """Serve a cloud stand-in on localhost, yields it with its base URL."""
+    stand_in = CloudStandIn()
+    server = await aiohttp_server(stand_in.app())
+    yield stand_in, str(server.make_url("/"))
+
+
+@pytest.fixture
+async def api(
+    hass: HomeAssistant, cloud: tuple[CloudStandIn, str]
+) -> AsyncGenerator[RainmakerAPI]:
+    """Return an API logged in to the cloud stand-in."""
+    api = RainmakerAPI(hass, cloud[1], "user", "password")
+    await api.async_connect()
+    yield api
+    await api.async_close()
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant, api: RainmakerAPI
+) -> AsyncGenerator[RainmakerCoordinator]:
+    """Return a coordinator refreshed from the cloud stand-in."""
+    coordinator = RainmakerCoordinator(hass, api)
+    await coordinator.async_refresh()
+    yield coordinator
+    await coordinator.async_shutdown()
@@ -0,0 +1,49 @@
+"""Tests for the Zehnder Multi Controller config and options flows."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.zehnder_multi_controller.const import DOMAIN
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from .conftest import CloudStandIn
+
+
+def _entry(hass: HomeAssistant, host: str) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: host, CONF_USERNAME: "user", CONF_PASSWORD: "password"},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def test_options_discover_nodes(
+    hass: HomeAssistant, cloud: tuple[CloudStandIn, str]
+) -> None:
+    """Options of an unloaded entry discover the nodes from the cloud."""
+    entry = _entry(hass, cloud[1])
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+
+    assert result["type"] is FlowResultType.FORM
+    defaults = result["data_schema"]({})
+    assert defaults["nodes"] == ["node1"]
+    assert defaults["params"] == ["temp", "temp_setpoint"]
+
+
+async def test_options_cloud_error(
+    hass: HomeAssistant, cloud: tuple[CloudStandIn, str]
+) -> None:
+    """A malformed node listing aborts the options flow."""
+    stand_in, host = cloud
+    stand_in.node_details = None
+    entry = _entry(hass, host)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "cannot_connect"
@@ -0,0 +1,152 @@
+"""Tests for writing params through the coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.zehnder_multi_controller.api import RainmakerError
+from custom_components.zehnder_multi_controller.coordinator import (
+    RainmakerCoordinator,
+)
+from homeassistant.core import HomeAssistant
+
+from .conftest import NODE_ID, CloudStandIn
+
+PARAMS_PATH = "/user/nodes/params"
+NODES_PATH = "/user/nodes"
+
+
+def _requests(stand_in: CloudStandIn, method: str, path: str) -> list:
+    return [
+        body for m, p, _query, body in stand_in.requests if m == method and p == path
+    ]
+
+
+async def _wait_for_requests(
+    stand_in: CloudStandIn, method: str, path: str, count: int
+) -> None:
+    async with asyncio.timeout(5):
+        while len(_requests(stand_in, method, path)) < count:
+            await asyncio.sleep(0.01)
+
+
+def _setpoint(coordinator: RainmakerCoordinator) -> float:
+    return coordinator.data[NODE_ID]["temp_setpoint"]["value"]
+
+
+async def test_writes_coalesced_in_order(
+    hass: HomeAssistant,
+    cloud: tuple[CloudStandIn, str],
+    coordinator: RainmakerCoordinator,
+) -> None:
+    """Writes issued during a write are sent and applied as one newer batch."""
+    stand_in, _ = cloud
+    published: list[float] = []
+    unsub = coordinator.async_add_listener(
+        lambda: published.append(_setpoint(coordinator)), (NODE_ID, "temp_setpoint")
+    )
+    stand_in.gates[PARAMS_PATH] = gate = asyncio.Event()
+
+    first = hass.async_create_task(
+        coordinator.async_set_params(NODE_ID, {"temp_setpoint": 25.0})
+    )
+    await _wait_for_requests(stand_in, "PUT", PARAMS_PATH, 1)
+    second = hass.async_create_task(
+        coordinator.api.async_set_params(NODE_ID, {"temp_setpoint": 18.0})
+    )
+    third = hass.async_create_task(
+        coordinator.async_set_params(NODE_ID, {"temp_setpoint": 20.0})
+    )
+    gate.set()
+    await asyncio.gather(first, second, third)
+    unsub()
+
+    assert _requests(stand_in, "PUT", PARAMS_PATH) == [
+        [{"node_id": NODE_ID, "payload": {"multicontrol": {"temp_setpoint": value}}}]
+        for value in (25.0, 20.0)
+    ]
+    # Every writer of a batch gets the values that were sent
+    assert second.result() == {"temp_setpoint": 20.0}
+    # 18 was never sent, so it is never published
+    assert published == [25.0, 20.0]
+    assert _setpoint(coordinator) == 20.0
+
+
+async def test_write_failure_reaches_every_writer(
+    hass: HomeAssistant,
+    cloud: tuple[CloudStandIn, str],
+    coordinator: RainmakerCoordinator,
+) -> None:
+    """A failed batch fails all of its writers and applies nothing."""
+    stand_in, _ = cloud
+    stand_in.gates[PARAMS_PATH] = gate = asyncio.Event()
+    writers = [
+        hass.async_create_task(
+            coordinator.async_set_params(NODE_ID, {"temp_setpoint": value})
+        )
+        for value in (25.0, 24.0, 23.0)
+    ]
+    await _wait_for_requests(stand_in, "PUT", PARAMS_PATH, 1)
+    stand_in.available = False
+    gate.set()
+
+    results = await asyncio.gather(*writers, return_exceptions=True)
+
+    assert len(_requests(stand_in, "PUT", PARAMS_PATH)) == 2
+    assert all(isinstance(result, RainmakerError) for result in results)
+    assert _setpoint(coordinator) == 22.0
+
+    stand_in.available = True
+    await coordinator.async_set_params(NODE_ID, {"temp_setpoint": 23.0})
+    assert _setpoint(coordinator) == 23.0
+
+
+async def test_ack_supersedes_older_poll(
+    hass: HomeAssistant,
+    cloud: tuple[CloudStandIn, str],
+    coordinator: RainmakerCoordinator,
+) -> None:
+    """A poll that started before an ack keeps the acked value, a newer one wins."""
+    stand_in, _ = cloud
+    stand_in.gates[NODES_PATH] = gate = asyncio.Event()
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    await _wait_for_requests(stand_in, "GET", NODES_PATH, 2)
+
+    await coordinator.async_set_params(NODE_ID, {"temp_setpoint": 25.0})
+    assert _setpoint(coordinator) == 25.0
+
+    gate.set()
+    await refresh
+    assert _setpoint(coordinator) == 25.0
+
+    # The cloud stand-in still serves 22.0, which a newer poll reports
+    await coordinator.async_refresh()
+    assert _setpoint(coordinator) == 22.0
+
+
+@pytest.mark.parametrize("cancelled", [1, 2])
+async def test_cancelled_writer_keeps_batch(
+    hass: HomeAssistant,
+    cloud: tuple[CloudStandIn, str],
+    coordinator: RainmakerCoordinator,
+    cancelled: int,
+) -> None:
+    """Cancelling one writer neither cancels its batch nor its other writers."""
+    stand_in, _ = cloud
+    stand_in.gates[PARAMS_PATH] = gate = asyncio.Event()
+    writers = [
+        hass.async_create_task(
+            coordinator.async_set_params(NODE_ID, {"temp_setpoint": value})
+        )
+        for value in (25.0, 24.0, 23.0)
+    ]
+    await _wait_for_requests(stand_in, "PUT", PARAMS_PATH, 1)
+
+    writers[cancelled].cancel()
+    gate.set()
+    await writers[3 - cancelled]
+
+    assert writers[cancelled].cancelled()
+    assert _setpoint(coordinator) == 23.0
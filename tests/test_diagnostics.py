@@ -0,0 +1,38 @@
+"""Tests for the config entry diagnostics."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.zehnder_multi_controller.const import DOMAIN
+from custom_components.zehnder_multi_controller.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .conftest import CloudStandIn
+
+
+async def test_diagnostics(
+    hass: HomeAssistant, cloud: tuple[CloudStandIn, str]
+) -> None:
+    """Setup timings cover the platform forward, also without the entry loaded."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: cloud[1], CONF_USERNAME: "user", CONF_PASSWORD: "password"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    spans = diagnostics["setup_timings"]["spans"]
+    assert spans["platforms"] >= spans["number.register"]
+    assert diagnostics["entry"]["data"][CONF_PASSWORD] == "**REDACTED**"
+    assert diagnostics["nodes"] == {"node1": ["temp", "temp_setpoint"]}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["setup_timings"] is None
+    assert diagnostics["nodes"] == {}
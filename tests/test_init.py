@@ -0,0 +1,164 @@
+"""Tests for setting up and unloading a config entry."""
+
+from __future__ import annotations
+
+import copy
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.zehnder_multi_controller.const import (
+    CONF_EXCLUDED_PARAMS,
+    DOMAIN,
+)
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    STATE_UNAVAILABLE,
+    Platform,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.update_coordinator import REQUEST_REFRESH_DEFAULT_COOLDOWN
+
+from .conftest import NODE_CONFIG, CloudStandIn
+
+
+async def _setup_entry(hass: HomeAssistant, host: str) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: host, CONF_USERNAME: "user", CONF_PASSWORD: "password"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_platforms_added_with_schema(
+    hass: HomeAssistant, cloud: tuple[CloudStandIn, str]
+) -> None:
+    """Platforms needed by new params are loaded once their forward returned."""
+    stand_in, host = cloud
+    entry = await _setup_entry(hass, host)
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    assert entry_data["platforms"] == {Platform.CLIMATE, Platform.NUMBER}
+
+    config = copy.deepcopy(NODE_CONFIG)
+    params = config["devices"][0]["params"]
+    params.append(
+        {"name": "power", "data_type": "bool", "properties": ["read", "write"]}
+    )
+    stand_in.node_details[0]["config"] = config
+    coordinator = entry_data["coordinator"]
+    with patch.object(
+        hass.config_entries,
+        "async_forward_entry_setups",
+        wraps=hass.config_entries.async_forward_entry_setups,
+    ) as forward:
+        await coordinator.async_refresh()
+        assert entry_data["pending_platforms"] == {Platform.SWITCH}
+        assert Platform.SWITCH not in entry_data["platforms"]
+
+        # A schema change while the forward is pending does not forward again
+        config = copy.deepcopy(config)
+        config["devices"][0]["params"].append(
+            {"name": "boost", "data_type": "bool", "properties": ["read", "write"]}
+        )
+        stand_in.node_details[0]["config"] = config
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    forward.assert_called_once_with(entry, [Platform.SWITCH])
+    assert entry_data["pending_platforms"] == set()
+    assert Platform.SWITCH in entry_data["platforms"]
+    assert hass.states.get("switch.node1_power") is not None
+    assert hass.states.get("switch.node1_boost") is not None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_states_follow_updates(
+    hass: HomeAssistant, cloud: tuple[CloudStandIn, str]
+) -> None:
+    """Entity states reflect every update, not only the first one."""
+    entry = await _setup_entry(hass, cloud[1])
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert hass.states.get("number.node1_temp_setpoint").state == "22.0"
+
+    coordinator.async_apply_params("node1", {"temp": 20.5, "temp_setpoint": 23.0})
+    await hass.async_block_till_done()
+
+    assert hass.states.get("number.node1_temp_setpoint").state == "23.0"
+    climate = hass.states.get("climate.node1")
+    assert climate.attributes["current_temperature"] == 20.5
+    assert climate.attributes["temperature"] == 23.0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def _async_update_options(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entry: MockConfigEntry,
+    options: dict[str, Any],
+) -> None:
+    hass.config_entries.async_update_entry(entry, options=options)
+    # Let the refresh debouncer cool down
+    freezer.tick(timedelta(seconds=REQUEST_REFRESH_DEFAULT_COOLDOWN + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_excluded_param_keeps_registry_entry(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entity_registry: er.EntityRegistry,
+    cloud: tuple[CloudStandIn, str],
+) -> None:
+    """Excluding a param removes its entity but keeps the user's settings."""
+    entry = await _setup_entry(hass, cloud[1])
+    entity_id = "number.node1_temp_setpoint"
+    entity_registry.async_update_entity(entity_id, name="Setpoint")
+
+    await _async_update_options(
+        hass, freezer, entry, {CONF_EXCLUDED_PARAMS: ["temp_setpoint"]}
+    )
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+    assert entity_registry.async_get(entity_id).name == "Setpoint"
+
+    await _async_update_options(hass, freezer, entry, {CONF_EXCLUDED_PARAMS: []})
+    assert hass.states.get(entity_id).state == "22.0"
+    assert hass.states.get(entity_id).name == "Setpoint"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_vanished_node_removes_device(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    device_registry: dr.DeviceRegistry,
+    cloud: tuple[CloudStandIn, str],
+) -> None:
+    """A node gone from the account takes its device and entities along."""
+    stand_in, host = cloud
+    entry = await _setup_entry(hass, host)
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "node1")})
+
+    stand_in.node_details = []
+    await hass.data[DOMAIN][entry.entry_id]["coordinator"].async_refresh()
+    await hass.async_block_till_done()
+
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "node1")}) is None
+    assert entity_registry.async_get("number.node1_temp_setpoint") is None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,94 @@
+"""Tests for the compiled param mapping."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from custom_components.zehnder_multi_controller.mapping import (
+    META_CLIMATE_ROLE,
+    META_UNIT,
+    ROLE_CURRENT_TEMPERATURE,
+    ROLE_TARGET_TEMPERATURE,
+    compile_node_schema,
+)
+
+# The primary device lists its params, the other device keys them by name
+CONFIG: dict[str, Any] = {
+    "node_id": "node1",
+    "devices": [
+        {
+            "name": "multicontrol",
+            "params": [
+                {"name": "Temp", "data_type": "float", "properties": ["read"]},
+                {
+                    "name": "temp_setpoint",
+                    "data_type": "float",
+                    "properties": ["read", "write"],
+                },
+            ],
+        },
+        {
+            "name": "zone2",
+            "params": {
+                "temp": {"data_type": "float", "properties": ["read"]},
+                "mode": {
+                    "data_type": "string",
+                    "properties": ["read"],
+                    "unit": "level",
+                },
+            },
+        },
+    ],
+    "services": [
+        {
+            "name": "time",
+            "params": [{"name": "tz", "data_type": "string", "properties": ["read"]}],
+        }
+    ],
+}
+VALUES = {
+    "multicontrol": {"Temp": 21.5, "temp_setpoint": 22.0},
+    "zone2": {"temp": 19.0, "mode": "eco"},
+    "time": {"tz": "UTC"},
+}
+
+
+def test_keys() -> None:
+    """Primary params keep their name, other devices are prefixed, services dropped."""
+    schema = compile_node_schema(CONFIG)
+
+    assert schema.keys == ["Temp", "temp_setpoint", "zone2.mode", "zone2.temp"]
+    assert schema.qualified_name("zone2.temp") == "zone2.temp"
+    assert schema.qualified_name("Temp") == "multicontrol.Temp"
+    assert compile_node_schema(dict(CONFIG)) is schema
+
+
+def test_transform() -> None:
+    """Values are merged into the metadata, with roles and units of the mapping."""
+    schema = compile_node_schema(CONFIG)
+    params = schema.transform(VALUES, set())
+
+    assert schema.transform(VALUES, {"zone2.temp"}).keys() == params.keys() - {
+        "zone2.temp"
+    }
+    assert params["Temp"]["value"] == 21.5
+    assert params["Temp"][META_CLIMATE_ROLE] == ROLE_CURRENT_TEMPERATURE
+    assert params["Temp"][META_UNIT] == "°C"
+    assert params["temp_setpoint"][META_CLIMATE_ROLE] == ROLE_TARGET_TEMPERATURE
+    # A unit of the node config is kept, other devices get no mapped units
+    assert params["zone2.mode"][META_UNIT] == "level"
+    assert params["zone2.mode"]["value"] == "eco"
+    assert META_UNIT not in params["zone2.temp"]
+
+
+def test_payload_round_trip() -> None:
+    """Serialized values flatten back to the same keys and values."""
+    schema = compile_node_schema(CONFIG)
+    values = {"temp_setpoint": 23.0, "zone2.temp": 18.5}
+
+    payload = schema.payload(values)
+
+    assert payload == {"multicontrol": {"temp_setpoint": 23.0}, "zone2": {"temp": 18.5}}
+    assert schema.flatten(payload) == values
+    # Unknown devices and params and non-object devices are skipped
+    assert schema.flatten({**payload, "time": {"tz": "UTC"}, "zone3": 1}) == values
@@ -0,0 +1,202 @@
+"""Tests for the MQTT push listener."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+import json
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+)
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from custom_components.zehnder_multi_controller.const import (
+    DEFAULT_SCAN_INTERVAL,
+    PUSH_SWEEP_INTERVAL,
+)
+from custom_components.zehnder_multi_controller.coordinator import (
+    RainmakerCoordinator,
+)
+from custom_components.zehnder_multi_controller.push import RainmakerPushListener
+from homeassistant.components.mqtt.const import MQTT_CONNECTION_STATE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .conftest import NODE_CONFIG, NODE_ID, NODE_PARAMS, CloudStandIn
+
+TOPIC = "node/+/params/local"
+SWEEP = timedelta(seconds=PUSH_SWEEP_INTERVAL)
+POLL = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Keep the periodic timer of the MQTT client from failing the tests."""
+    return True
+
+
+@pytest.fixture
+async def listener(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    coordinator: RainmakerCoordinator,
+) -> AsyncGenerator[RainmakerPushListener]:
+    """Return a push listener subscribed to the mocked broker."""
+    listener = RainmakerPushListener(hass, coordinator, TOPIC)
+    await listener.async_start()
+    yield listener
+    listener.async_stop()
+
+
+def _fire(hass: HomeAssistant, node_id: str, payload: Any) -> None:
+    if not isinstance(payload, str):
+        payload = json.dumps(payload)
+    async_fire_mqtt_message(hass, f"node/{node_id}/params/local", payload)
+
+
+async def test_payload_applied(
+    hass: HomeAssistant,
+    listener: RainmakerPushListener,
+    coordinator: RainmakerCoordinator,
+) -> None:
+    """A pushed params payload updates the coordinator data."""
+    _fire(hass, NODE_ID, {"multicontrol": {"temp": 23.5}})
+    await hass.async_block_till_done()
+
+    assert coordinator.data[NODE_ID]["temp"]["value"] == 23.5
+    assert coordinator.data[NODE_ID]["temp_setpoint"]["value"] == 22.0
+
+
+async def _poll(hass: HomeAssistant, coordinator: RainmakerCoordinator) -> None:
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+
+def _set_cloud_temp(stand_in: CloudStandIn, value: float) -> None:
+    stand_in.node_details = [
+        {
+            "id": NODE_ID,
+            "config": NODE_CONFIG,
+            "params": {"multicontrol": {**NODE_PARAMS["multicontrol"], "temp": value}},
+        }
+    ]
+
+
+async def test_connection_alone_not_healthy(
+    hass: HomeAssistant,
+    listener: RainmakerPushListener,
+    coordinator: RainmakerCoordinator,
+) -> None:
+    """A connected stream is verified by polls that find nothing missed."""
+    assert not listener.healthy
+    assert coordinator.update_interval == POLL
+
+    # The first poll catches up on the time before the connect
+    await _poll(hass, coordinator)
+    assert not listener.healthy
+
+    await _poll(hass, coordinator)
+    assert listener.healthy
+    assert coordinator.update_interval == SWEEP
+
+    async_dispatcher_send(hass, MQTT_CONNECTION_STATE, False)
+    await hass.async_block_till_done()
+    assert not listener.healthy
+    assert coordinator.update_interval == POLL
+
+    async_dispatcher_send(hass, MQTT_CONNECTION_STATE, True)
+    await hass.async_block_till_done()
+    assert not listener.healthy
+
+    await _poll(hass, coordinator)
+    await _poll(hass, coordinator)
+    assert listener.healthy
+    assert coordinator.update_interval == SWEEP
+
+
+async def test_message_verifies_stream(
+    hass: HomeAssistant,
+    listener: RainmakerPushListener,
+    coordinator: RainmakerCoordinator,
+) -> None:
+    """A message makes a connected stream healthy without waiting for polls."""
+    _fire(hass, NODE_ID, {"multicontrol": {"temp": 23.5}})
+    await hass.async_block_till_done()
+
+    assert listener.healthy
+    assert coordinator.update_interval == SWEEP
+
+
+async def test_missed_changes_resume_polling(
+    hass: HomeAssistant,
+    cloud: tuple[CloudStandIn, str],
+    listener: RainmakerPushListener,
+    coordinator: RainmakerCoordinator,
+) -> None:
+    """A poll finding changes the stream missed resumes polling until a message."""
+    stand_in, _ = cloud
+    await _poll(hass, coordinator)
+    await _poll(hass, coordinator)
+    assert listener.healthy
+
+    _set_cloud_temp(stand_in, 24.0)
+    await _poll(hass, coordinator)
+    assert not listener.healthy
+    assert coordinator.update_interval == POLL
+
+    # Quiet polls do not verify a stream caught missing changes
+    await _poll(hass, coordinator)
+    assert not listener.healthy
+
+    _fire(hass, NODE_ID, {"multicontrol": {"temp": 24.5}})
+    await hass.async_block_till_done()
+    assert listener.healthy
+    assert coordinator.update_interval == SWEEP
+
+
+async def test_pushed_changes_not_missed(
+    hass: HomeAssistant,
+    cloud: tuple[CloudStandIn, str],
+    listener: RainmakerPushListener,
+    coordinator: RainmakerCoordinator,
+) -> None:
+    """Changes the stream delivered before the poll keep it healthy."""
+    stand_in, _ = cloud
+    await _poll(hass, coordinator)
+    await _poll(hass, coordinator)
+
+    _set_cloud_temp(stand_in, 24.0)
+    _fire(hass, NODE_ID, {"multicontrol": {"temp": 24.0}})
+    await _poll(hass, coordinator)
+
+    assert listener.healthy
+    assert coordinator.update_interval == SWEEP
+
+
+@pytest.mark.parametrize(
+    ("node_id", "payload"),
+    [
+        ("other", {"multicontrol": {"temp": 23.5}}),
+        (NODE_ID, "not json"),
+        (NODE_ID, [23.5]),
+        (NODE_ID, {"multicontrol": "23.5"}),
+        (NODE_ID, {"unknown": {"temp": 23.5}}),
+    ],
+)
+async def test_bad_messages_ignored(
+    hass: HomeAssistant,
+    listener: RainmakerPushListener,
+    coordinator: RainmakerCoordinator,
+    node_id: str,
+    payload: Any,
+) -> None:
+    """Messages for unknown nodes or with malformed payloads change nothing."""
+    data = coordinator.data
+
+    _fire(hass, node_id, payload)
+    await hass.async_block_till_done()
+
+    assert coordinator.data is data
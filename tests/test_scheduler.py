@@ -0,0 +1,57 @@
+"""Tests for the shared request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.zehnder_multi_controller.const import (
+    PRIORITY_BULK,
+    PRIORITY_POLL,
+    PRIORITY_WRITE,
+)
+from custom_components.zehnder_multi_controller.scheduler import _TokenBucket
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Keep the refill timer of a bucket with waiters from failing the tests."""
+    return True
+
+
+async def test_bulk_leaves_reserve() -> None:
+    """Bulk requests cannot take the reserved part of the burst."""
+    bucket = _TokenBucket(rate=0.01, capacity=4, reserve=2)
+
+    await bucket.async_acquire(PRIORITY_BULK)
+    await bucket.async_acquire(PRIORITY_BULK)
+    bulk = asyncio.create_task(bucket.async_acquire(PRIORITY_BULK))
+    await asyncio.sleep(0)
+    assert not bulk.done()
+
+    # Writes and polls are served from the reserve right away
+    await asyncio.wait_for(bucket.async_acquire(PRIORITY_WRITE), 1)
+    await asyncio.wait_for(bucket.async_acquire(PRIORITY_POLL), 1)
+    assert not bulk.done()
+    bulk.cancel()
+
+
+async def test_priority_order() -> None:
+    """Queued requests are served by priority once tokens refill."""
+    bucket = _TokenBucket(rate=50, capacity=1, reserve=0)
+    await bucket.async_acquire(PRIORITY_POLL)
+    served: list[int] = []
+
+    async def acquire(priority: int) -> None:
+        await bucket.async_acquire(priority)
+        served.append(priority)
+
+    tasks = [
+        asyncio.create_task(acquire(priority))
+        for priority in (PRIORITY_BULK, PRIORITY_POLL, PRIORITY_WRITE)
+    ]
+    await asyncio.sleep(0)
+    await asyncio.wait_for(asyncio.gather(*tasks), 1)
+
+    assert served == [PRIORITY_WRITE, PRIORITY_POLL, PRIORITY_BULK]
@@ -0,0 +1,31 @@
+"""Tests for the param sensors."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from custom_components.zehnder_multi_controller.mapping import META_UNIT
+from custom_components.zehnder_multi_controller.sensor import _build_entities
+from homeassistant.components.sensor import SensorDeviceClass
+
+
+def test_unit_from_meta() -> None:
+    """The unit and device class follow the unit of the param metadata."""
+    params = {
+        "outdoor": {"data_type": "string", META_UNIT: "°C"},
+        "temp_label": {"data_type": "string"},
+        "mode": {"data_type": "string", META_UNIT: "level"},
+    }
+
+    entities = {
+        entity._param: entity
+        for entity in _build_entities(MagicMock(), "entry", "node1", params)
+    }
+
+    assert entities["outdoor"].native_unit_of_measurement == "°C"
+    assert entities["outdoor"].device_class is SensorDeviceClass.TEMPERATURE
+    # The name no longer implies a temperature
+    assert entities["temp_label"].native_unit_of_measurement is None
+    assert entities["temp_label"].device_class is None
+    assert entities["mode"].native_unit_of_measurement == "level"
+    assert entities["mode"].device_class is None
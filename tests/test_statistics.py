@@ -0,0 +1,210 @@
+"""Tests for the long-term statistics backfill."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.zehnder_multi_controller.api import RainmakerAPI
+from custom_components.zehnder_multi_controller.const import (
+    DOMAIN,
+    STATISTICS_SAVE_DELAY,
+)
+from custom_components.zehnder_multi_controller.mapping import compile_node_schema
+from custom_components.zehnder_multi_controller.statistics import (
+    RainmakerStatisticsImporter,
+    _hourly_statistics,
+)
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.models import StatisticMeanType
+from homeassistant.components.recorder.statistics import (
+    get_metadata,
+    statistics_during_period,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .conftest import NODE_CONFIG, NODE_ID, NODE_PARAMS, CloudStandIn
+
+NOW = datetime(2026, 1, 10, 12, 30, tzinfo=dt_util.UTC)
+END_TS = int(NOW.replace(minute=0).timestamp())
+
+
+def test_hourly_statistics() -> None:
+    """Samples are bucketed per hour, skipping unusable and incomplete ones."""
+    hour = END_TS - 7200
+    samples = [
+        (hour + 10, 20),
+        (hour + 1800, "22.0"),
+        (hour + 3599, None),
+        (hour + 3600, 18.5),
+        (hour + 3700, "n/a"),
+        (END_TS, 30),
+    ]
+
+    rows = _hourly_statistics(samples, END_TS)
+
+    assert [row["start"] for row in rows] == [
+        dt_util.utc_from_timestamp(hour),
+        dt_util.utc_from_timestamp(hour + 3600),
+    ]
+    assert (rows[0]["mean"], rows[0]["min"], rows[0]["max"]) == (21.0, 20.0, 22.0)
+    assert (rows[1]["mean"], rows[1]["min"], rows[1]["max"]) == (18.5, 18.5, 18.5)
+
+
+async def test_param_history_pages(
+    api: RainmakerAPI, cloud: tuple[CloudStandIn, str]
+) -> None:
+    """History is fetched page by page following `next_id`."""
+    stand_in = cloud[0]
+    stand_in.tsdata_pages = [
+        {"ts_data": [{"values": [{"ts": 1, "val": 20.0}]}], "next_id": "page2"},
+        {"ts_data": [{"values": [{"ts": 2, "val": 21.0}, {"ts": 3, "val": 22.0}]}]},
+    ]
+
+    samples = await api.async_get_param_history(NODE_ID, "temp", "float", 0, 10)
+
+    assert samples == [(1, 20.0), (2, 21.0), (3, 22.0)]
+    queries = [
+        query for _, path, query, _ in stand_in.requests if path.endswith("tsdata")
+    ]
+    assert [query.get("start_id") for query in queries] == [None, "page2"]
+    assert queries[0]["param_name"] == "multicontrol.temp"
+
+
+async def test_param_history_unsupported(api: RainmakerAPI) -> None:
+    """A backend without the time-series endpoint returns None."""
+    assert await api.async_get_param_history(NODE_ID, "temp", "float", 0, 10) is None
+
+
+def _coordinator_data() -> dict[str, dict[str, dict[str, Any]]]:
+    return {NODE_ID: compile_node_schema(NODE_CONFIG).transform(NODE_PARAMS, set())}
+
+
+async def test_backfill_resumes_from_watermark(
+    hass: HomeAssistant, hass_storage: dict[str, Any], freezer: FrozenDateTimeFactory
+) -> None:
+    """The backfill starts at the stored watermark and persists the new one."""
+    freezer.move_to(NOW)
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    storage_key = f"{DOMAIN}.{entry.entry_id}.statistics"
+    resume_ts = END_TS - 3 * 3600
+    hass_storage[storage_key] = {
+        "version": 1,
+        "key": storage_key,
+        "data": {"watermarks": {NODE_ID: {"temp": resume_ts}}},
+    }
+    api = AsyncMock(spec=RainmakerAPI)
+    api.async_get_param_history.return_value = [(resume_ts + 60, 21.0)]
+    coordinator = AsyncMock(data=_coordinator_data())
+
+    importer = RainmakerStatisticsImporter(hass, api, coordinator, entry)
+    with patch(
+        "custom_components.zehnder_multi_controller.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        await importer.async_backfill()
+
+    starts = {
+        call.args[1]: call.args[3]
+        for call in api.async_get_param_history.call_args_list
+    }
+    assert starts["temp"] == resume_ts
+    # Params without a watermark go back as far as the backfill allows
+    assert starts["temp_setpoint"] == END_TS - 7 * 24 * 3600
+    metadata = {
+        call.args[1]["statistic_id"]: call.args[1]
+        for call in add_statistics.call_args_list
+    }
+    assert metadata[f"{DOMAIN}:node1_temp"]["unit_of_measurement"] == "°C"
+    # The watermarks of a run are written once, after the save delay
+    assert hass_storage[storage_key]["data"]["watermarks"] == {
+        NODE_ID: {"temp": resume_ts}
+    }
+    freezer.tick(timedelta(seconds=STATISTICS_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass_storage[storage_key]["data"]["watermarks"] == {
+        NODE_ID: {"temp": END_TS, "temp_setpoint": END_TS}
+    }
+
+    # A new importer resumes from the persisted watermarks, an hour later
+    api.async_get_param_history.reset_mock()
+    freezer.tick(timedelta(hours=1))
+    importer = RainmakerStatisticsImporter(hass, api, coordinator, entry)
+    with patch(
+        "custom_components.zehnder_multi_controller.statistics.async_add_external_statistics"
+    ):
+        await importer.async_backfill()
+
+    assert {call.args[3] for call in api.async_get_param_history.call_args_list} == {
+        END_TS
+    }
+    freezer.tick(timedelta(seconds=STATISTICS_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_backfill_recorded(recorder_mock: Recorder, hass: HomeAssistant) -> None:
+    """Imported hours are stored as temperature statistics with a mean."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    end = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    start_ts = int(end.timestamp()) - 2 * 3600
+    api = AsyncMock(spec=RainmakerAPI)
+    api.async_get_param_history.return_value = [
+        (start_ts + 60, 20.0),
+        (start_ts + 120, 22.0),
+        (start_ts + 3660, 19.0),
+    ]
+    coordinator = AsyncMock(data=_coordinator_data())
+
+    await RainmakerStatisticsImporter(hass, api, coordinator, entry).async_backfill()
+    await async_wait_recording_done(hass)
+
+    statistic_id = f"{DOMAIN}:node1_temp"
+    stats = await recorder_mock.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        end - timedelta(hours=3),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        {"mean", "min", "max"},
+    )
+    assert [
+        (row["start"], row["mean"], row["min"], row["max"])
+        for row in stats[statistic_id]
+    ] == [
+        (start_ts, 21.0, 20.0, 22.0),
+        (start_ts + 3600, 19.0, 19.0, 19.0),
+    ]
+    metadata = await recorder_mock.async_add_executor_job(
+        partial(get_metadata, hass, statistic_ids={statistic_id})
+    )
+    assert metadata[statistic_id][1]["unit_of_measurement"] == "°C"
+    assert metadata[statistic_id][1]["mean_type"] is StatisticMeanType.ARITHMETIC
+
+
+async def test_param_history_public_call(api: RainmakerAPI) -> None:
+    """A client with a public time-series call is used instead of its session."""
+    page = {"ts_data": [{"values": [{"ts": 1, "val": 20.0}]}]}
+    with patch.object(
+        api._client, "async_get_tsdata", AsyncMock(return_value=page), create=True
+    ) as get_tsdata:
+        samples = await api.async_get_param_history(NODE_ID, "temp", "float", 0, 10)
+
+    assert samples == [(1, 20.0)]
+    assert get_tsdata.call_args.args[0]["param_name"] == "multicontrol.temp"
@@ -0,0 +1,241 @@
+"""Tests for the ESP local control transport."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import web
+import pytest
+
+from custom_components.zehnder_multi_controller.api import (
+    RainmakerAPI,
+    RainmakerConnectionError,
+)
+from custom_components.zehnder_multi_controller.transport import (
+    LocalControlError,
+    LocalTransport,
+    _field,
+    _parse,
+    _varint,
+)
+from homeassistant.core import HomeAssistant
+
+from .conftest import NODE_CONFIG, NODE_ID, NODE_PARAMS, CloudStandIn
+
+
+class DeviceStandIn:
+    """Stand-in for the ESP local control service of a node."""
+
+    def __init__(self) -> None:
+        self.properties: dict[str, bytes] = {
+            "config": json.dumps(NODE_CONFIG).encode(),
+            "params": json.dumps(NODE_PARAMS).encode(),
+        }
+        self.commands: list[int] = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/esp_local_ctrl/session", self._session)
+        app.router.add_post("/esp_local_ctrl/control", self._control)
+        return app
+
+    async def _session(self, request: web.Request) -> web.Response:
+        # SessionData with security scheme 0 and an empty S0SessionResp
+        return web.Response(body=b"\x52\x03\xaa\x01\x00")
+
+    async def _control(self, request: web.Request) -> web.Response:
+        message = _parse(await request.read())
+        msg_type = message[1][0]
+        self.commands.append(msg_type)
+        names = list(self.properties)
+        if msg_type == 0:
+            resp = _field(11, _field(1, 0) + _field(2, len(names)))
+        elif msg_type == 4:
+            indices = _unpack(_parse(message[12][0])[1][0])
+            props = b"".join(
+                _field(
+                    2,
+                    _field(1, 0)
+                    + _field(2, names[i].encode())
+                    + _field(5, self.properties[names[i]]),
+                )
+                for i in indices
+            )
+            resp = _field(13, _field(1, 0) + props)
+        else:
+            value = _parse(_parse(message[14][0])[1][0])
+            params = json.loads(self.properties["params"])
+            for device, values in json.loads(value[2][0]).items():
+                params.setdefault(device, {}).update(values)
+            self.properties[names[value[1][0]]] = json.dumps(params).encode()
+            resp = _field(15, _field(1, 0))
+        return web.Response(body=_field(1, msg_type + 1) + resp)
+
+
+def _unpack(data: bytes) -> list[int]:
+    """Decode packed repeated varints."""
+    values, value, shift = [], 0, 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+@pytest.fixture
+async def device(
+    aiohttp_server: Any, socket_enabled: None
+) -> AsyncGenerator[tuple[DeviceStandIn, str]]:
+    """Serve a device stand-in, yields it with its endpoint."""
+    stand_in = DeviceStandIn()
+    server = await aiohttp_server(stand_in.app())
+    yield stand_in, str(server.make_url("")).rstrip("/")
+
+
+def _resolve(endpoint: str | None) -> Any:
+    return patch.object(
+        LocalTransport, "_async_resolve", AsyncMock(return_value=endpoint)
+    )
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {1: [0]},
+        {1: [300], 2: [b"abc", b"d"]},
+        {15: [2**40], 3: [b""], 12: [_field(1, b"nested")]},
+    ],
+)
+def test_parse_field_round_trip(fields: dict[int, list[int | bytes]]) -> None:
+    """Encoded fields decode to the same numbers and values."""
+    encoded = b"".join(
+        _field(number, value) for number, values in fields.items() for value in values
+    )
+    assert _parse(encoded) == fields
+
+
+def test_parse_unsupported_wire_type() -> None:
+    """Fixed width fields are not used by local control and rejected."""
+    with pytest.raises(LocalControlError):
+        _parse(_varint(1 << 3 | 5) + b"\x00\x00\x00\x00")
+
+
+async def test_read_params(
+    hass: HomeAssistant, device: tuple[DeviceStandIn, str]
+) -> None:
+    """Node config and params are read from the local control properties."""
+    transport = LocalTransport(hass)
+    with _resolve(device[1]):
+        nodes = await transport.async_get_nodes({NODE_ID})
+
+    assert nodes == {
+        NODE_ID: {"id": NODE_ID, "config": NODE_CONFIG, "params": NODE_PARAMS}
+    }
+
+
+async def test_write_params(
+    hass: HomeAssistant, device: tuple[DeviceStandIn, str]
+) -> None:
+    """Params are written to the params property of a resolved node."""
+    stand_in, endpoint = device
+    transport = LocalTransport(hass)
+    payload = {"multicontrol": {"temp_setpoint": 23.0}}
+    with _resolve(endpoint) as resolve:
+        # Writes never wait for an mDNS lookup
+        assert not await transport.async_set_params(NODE_ID, payload)
+        resolve.assert_not_called()
+
+        await transport.async_get_nodes({NODE_ID})
+        assert await transport.async_set_params(NODE_ID, payload)
+        nodes = await transport.async_get_nodes({NODE_ID})
+
+    assert nodes[NODE_ID]["params"]["multicontrol"]["temp_setpoint"] == 23.0
+    assert stand_in.commands.count(6) == 1
+    await transport.async_close()
+
+
+async def test_close_with_api(
+    hass: HomeAssistant, api: RainmakerAPI, device: tuple[DeviceStandIn, str]
+) -> None:
+    """Closing the API closes the session of the local transport."""
+    api.local = LocalTransport(hass)
+    with _resolve(device[1]):
+        await api.local.async_get_nodes({NODE_ID})
+    session = api.local._session
+    assert session is not None
+
+    await api.async_close()
+
+    assert session.closed
+    assert api.local._session is None
+
+
+@pytest.mark.parametrize("params", [b"not json", b"\xff", b"[]"])
+async def test_malformed_params(
+    hass: HomeAssistant, device: tuple[DeviceStandIn, str], params: bytes
+) -> None:
+    """A node with malformed params counts as unreachable."""
+    stand_in, endpoint = device
+    stand_in.properties["params"] = params
+    transport = LocalTransport(hass)
+    with _resolve(endpoint):
+        assert await transport.async_get_nodes({NODE_ID, "node2"}) == {}
+
+
+async def test_cloud_fallback(
+    hass: HomeAssistant,
+    api: RainmakerAPI,
+    cloud: tuple[CloudStandIn, str],
+    device: tuple[DeviceStandIn, str],
+) -> None:
+    """Unreachable nodes come from the cloud, a cloud outage from the LAN."""
+    stand_in, _ = cloud
+    cloud_params = {"multicontrol": {"temp": 19.0, "temp_setpoint": 20.0}}
+    stand_in.node_details = [
+        {"id": NODE_ID, "config": NODE_CONFIG, "params": cloud_params},
+        {"id": "node2", "config": NODE_CONFIG, "params": cloud_params},
+    ]
+    api.local = LocalTransport(hass)
+    resolve = AsyncMock(
+        side_effect=lambda node_id: device[1] if node_id == NODE_ID else None
+    )
+    with patch.object(LocalTransport, "_async_resolve", resolve):
+        # The first listing comes from the cloud
+        data = await api.async_get_nodes()
+        assert [nd["params"] for nd in data["node_details"]] == [cloud_params] * 2
+
+        # node2 is not reachable locally and read from the cloud
+        data = await api.async_get_nodes()
+        assert [nd["params"] for nd in data["node_details"]] == [
+            NODE_PARAMS,
+            cloud_params,
+        ]
+
+        # Without the cloud, node2 is listed without values
+        stand_in.available = False
+        data = await api.async_get_nodes()
+        assert data["nodes"] == [NODE_ID, "node2"]
+        assert [nd["params"] for nd in data["node_details"]] == [NODE_PARAMS, {}]
+
+    api.local = LocalTransport(hass)
+    with _resolve(None), pytest.raises(RainmakerConnectionError):
+        await api.async_get_nodes()
+
+
+async def test_excluded_nodes_not_polled(
+    hass: HomeAssistant, api: RainmakerAPI, device: tuple[DeviceStandIn, str]
+) -> None:
+    """Nodes excluded by the selection are not read over local control."""
+    api.local = LocalTransport(hass)
+    await api.async_get_nodes()
+    api.excluded_nodes = {NODE_ID}
+
+    with _resolve(device[1]) as resolve:
+        await api.async_get_nodes()
+
+    resolve.assert_not_called()